@@ -9,6 +9,7 @@ from dotenv import load_dotenv
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
 from tg_translator.db import Database
 from tg_translator.translator_service import TranslatorService
@@ -31,7 +32,7 @@ app = FastAPI(
 
 # Initialize Database and Service
 # We use the same DB as the bot to share dictionaries
-db = Database()
+db = Database(os.getenv("DB_PATH") or "dictionary.db")
 service = TranslatorService(db=db)
 
 
@@ -103,6 +104,16 @@ class ChatStatusResponse(BaseModel):
     presets: dict[str, str]
 
 
+class TranslateResponse(BaseModel):
+    translation: str
+    source: str
+    target: str
+
+
+class DictListResponse(BaseModel):
+    terms: list[tuple[str, str]]
+
+
 class DictAddRequest(BaseModel):
     chat_id: str
     source: str
@@ -216,7 +227,7 @@ async def get_chat_status(chat_id: str):
     )
 
 
-@app.post("/translate", tags=["Core"])
+@app.post("/translate", response_model=TranslateResponse, tags=["Core"])
 async def translate_text(req: TranslateRequest):
     """
     Smart Translation endpoint.
@@ -253,11 +264,9 @@ async def translate_text(req: TranslateRequest):
                 status_code=500, detail="Translation returned empty result"
             )
 
-        return {
-            "translation": result,
-            "source": req.source_lang,
-            "target": req.target_lang,
-        }
+        return TranslateResponse(
+            translation=result, source=req.source_lang, target=req.target_lang
+        )
 
     except Exception as e:
         logger.error(f"API Translation error: {e}")
@@ -324,8 +333,8 @@ async def text_to_speech(req: TTSRequest):
             path,
             media_type="audio/mpeg",
             filename=f"tts_{req.lang}.mp3",
-            # We can use a background task to clean up the file after sending,
-            # but FastAPI BackgroundTasks makes it easy.
+            # Delete the generated file once the response has been sent
+            background=BackgroundTask(remove_file, path),
         )
 
     except Exception as e:
@@ -333,7 +342,7 @@ async def text_to_speech(req: TTSRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Cleanup helper (Optional, to be used with BackgroundTasks if needed)
+# Cleanup helper for generated files (run as a response background task)
 def remove_file(path: str):
     try:
         os.remove(path)
@@ -354,10 +363,11 @@ async def add_term(req: DictAddRequest):
     if not variations:
         variations = {req.source}
 
-    count = 0
-    for variant in variations:
-        if db.add_term(req.chat_id, variant, req.target, lang_pair):
-            count += 1
+    count = db.add_terms(
+        req.chat_id, [(variant, req.target) for variant in variations], lang_pair
+    )
+    if count is None:
+        raise HTTPException(status_code=500, detail="Failed to add term")
 
     return {"status": "ok", "added_count": count}
 
@@ -374,11 +384,11 @@ async def remove_term(req: DictRemoveRequest):
         raise HTTPException(status_code=404, detail="Term not found")
 
 
-@app.get("/dict/list/{chat_id}", tags=["Dictionary"])
+@app.get("/dict/list/{chat_id}", response_model=DictListResponse, tags=["Dictionary"])
 async def list_terms(chat_id: str, source_lang: str = "ru", target_lang: str = "en"):
     """List terms for a chat and language pair."""
     langs = sorted([source_lang, target_lang])
     lang_pair = f"{langs[0]}-{langs[1]}"
 
     terms = db.get_terms(chat_id, lang_pair)
-    return {"terms": terms}
+    return DictListResponse(terms=terms)
@@ -1,7 +1,7 @@
 import logging
 import sqlite3
 import uuid
-from typing import List, Optional, Tuple, Union, cast
+from typing import Iterable, List, Optional, Tuple, Union, cast
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +15,9 @@ class Database:
         """
         Create a new database connection.
         Using a new connection per operation is thread-safe and robust for SQLite.
+        db_path may also be a SQLite URI (file:...), e.g. a shared in-memory DB.
         """
-        return sqlite3.connect(self.db_path)
+        return sqlite3.connect(self.db_path, uri=self.db_path.startswith("file:"))
 
     def _init_db(self) -> None:
         """Initialize the database schema and migrate if necessary."""
@@ -238,6 +239,56 @@ class Database:
             logger.error(f"Error adding term: {e}")
             return False
 
+    def add_terms(
+        self,
+        chat_id: Union[int, str],
+        pairs: Iterable[Tuple[str, str]],
+        lang_pair: str = "ru-en",
+    ) -> Optional[int]:
+        """
+        Add or update several terms in one transaction.
+        Pairs already stored with the same target are skipped.
+        Returns the number of rows written, or None on error.
+        """
+        try:
+            lang_pair = lang_pair.strip().lower()
+            cleaned = {}
+            for source, target in pairs:
+                source_lower = source.strip().lower()
+                target_clean = target.strip()
+                if source_lower and target_clean:
+                    cleaned[source_lower] = target_clean
+
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT source_term, target_term
+                    FROM dictionary
+                    WHERE chat_id = ? AND lang_pair = ?
+                    """,
+                    (chat_id, lang_pair),
+                )
+                existing = dict(cursor.fetchall())
+                rows = [
+                    (chat_id, lang_pair, source, target)
+                    for source, target in cleaned.items()
+                    if existing.get(source) != target
+                ]
+                if rows:
+                    cursor.executemany(
+                        """
+                        INSERT OR REPLACE INTO dictionary (chat_id, lang_pair, source_term, target_term)
+                        VALUES (?, ?, ?, ?)
+                        """,
+                        rows,
+                    )
+                    conn.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error adding terms: {e}")
+            return None
+
     def remove_term(
         self, chat_id: Union[int, str], source: str, lang_pair: str = "ru-en"
     ) -> bool:
@@ -283,6 +334,40 @@ class Database:
             logger.error(f"Error fetching terms: {e}")
             return []
 
+    def get_chat_translation_settings(
+        self, chat_id: Union[int, str]
+    ) -> Tuple[str, str, List[Tuple[str, str]]]:
+        """
+        Get the language pair and its dictionary terms over one connection.
+        Returns ('ru', 'en', []) by default.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT primary_lang, secondary_lang
+                    FROM settings
+                    WHERE chat_id = ?
+                    """,
+                    (chat_id,),
+                )
+                row = cursor.fetchone()
+                primary, secondary = row if row else ("ru", "en")
+                langs = sorted([primary, secondary])
+                cursor.execute(
+                    """
+                    SELECT source_term, target_term
+                    FROM dictionary
+                    WHERE chat_id = ? AND lang_pair = ?
+                    """,
+                    (chat_id, f"{langs[0]}-{langs[1]}".lower()),
+                )
+                return primary, secondary, cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error fetching translation settings: {e}")
+            return ("ru", "en", [])
+
     # --- Settings Methods ---
 
     def set_languages(
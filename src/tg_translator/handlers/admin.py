@@ -1,6 +1,9 @@
+import asyncio
 import io
 import logging
 import os
+import time
+from typing import Dict
 
 from telegram import BotCommandScopeChat, Update
 from telegram.constants import ParseMode
@@ -10,6 +13,40 @@ from tg_translator.commands import BOT_COMMANDS
 
 logger = logging.getLogger(__name__)
 
+# Default number of message IDs /clean looks back through
+# (override with bot_data["clean_scan_limit"])
+CLEAN_SCAN_LIMIT = 200
+
+# Skip re-sending the command list to a chat refreshed within this many seconds
+SCOPE_REFRESH_TTL = 60.0
+# {chat_id: monotonic time of the last successful refresh}
+_scope_refreshed: Dict[int, float] = {}
+
+
+async def _refresh_chat_commands(
+    context: ContextTypes.DEFAULT_TYPE, chat_id: int
+) -> None:
+    """Set the chat-scoped command list, at most once per SCOPE_REFRESH_TTL."""
+    now = time.monotonic()
+    last = _scope_refreshed.get(chat_id)
+    if last is not None and now - last < SCOPE_REFRESH_TTL:
+        return
+
+    try:
+        await context.bot.set_my_commands(
+            BOT_COMMANDS, scope=BotCommandScopeChat(chat_id)
+        )
+    except Exception as e:
+        logger.error(f"Failed to refresh commands for chat {chat_id}: {e}")
+        return
+
+    if len(_scope_refreshed) >= 1024:
+        # Drop expired entries so the map does not grow with every chat seen
+        for stale_id, ts in list(_scope_refreshed.items()):
+            if now - ts >= SCOPE_REFRESH_TTL:
+                del _scope_refreshed[stale_id]
+    _scope_refreshed[chat_id] = now
+
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a welcome message when the command /start is issued."""
@@ -21,14 +58,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     db.set_mode(update.effective_chat.id, "auto")
 
     # Force update commands for this specific chat
-    try:
-        await context.bot.set_my_commands(
-            BOT_COMMANDS, scope=BotCommandScopeChat(update.effective_chat.id)
-        )
-    except Exception as e:
-        logger.error(
-            f"Failed to refresh commands for chat {update.effective_chat.id}: {e}"
-        )
+    await _refresh_chat_commands(context, update.effective_chat.id)
 
     await update.message.reply_text(
         "Привет! Я бот-переводчик. Я автоматически перевожу сообщения в этом чате.\n"
@@ -42,14 +72,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         return
 
     # Force update commands for this specific chat
-    try:
-        await context.bot.set_my_commands(
-            BOT_COMMANDS, scope=BotCommandScopeChat(update.effective_chat.id)
-        )
-    except Exception as e:
-        logger.error(
-            f"Failed to refresh commands for chat {update.effective_chat.id}: {e}"
-        )
+    await _refresh_chat_commands(context, update.effective_chat.id)
 
     await update.message.reply_text(
         "🤖 <b>Справка / Help</b>\n\n"
@@ -300,22 +323,25 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     chat_id = update.effective_chat.id
     db = context.bot_data["db"]
 
-    # Gather data
-    mode = db.get_mode(chat_id)
-    lang_primary, lang_secondary = db.get_languages(chat_id)
-    voice_gender = db.get_voice_gender(chat_id)
+    # Gather data. SQLite calls are blocking (and the dictionary can be large),
+    # so they run in a worker thread to keep the event loop free.
+    mode = await asyncio.to_thread(db.get_mode, chat_id)
+    lang_primary, lang_secondary = await asyncio.to_thread(db.get_languages, chat_id)
+    voice_gender = await asyncio.to_thread(db.get_voice_gender, chat_id)
 
     # Dictionary stats
     # get_terms expects lang_pair string (sorted)
     langs = sorted([lang_primary, lang_secondary])
     lang_pair = f"{langs[0]}-{langs[1]}"
-    terms = db.get_terms(chat_id, lang_pair)
+    terms = await asyncio.to_thread(db.get_terms, chat_id, lang_pair)
     dict_count = len(terms) if terms else 0
 
     # Voice Presets
     presets_info = []
     for lang in [lang_primary, lang_secondary]:
-        preset = db.get_voice_preset(chat_id, lang, voice_gender)
+        preset = await asyncio.to_thread(
+            db.get_voice_preset, chat_id, lang, voice_gender
+        )
         if preset:
             presets_info.append(f"{lang.upper()}: {preset}")
 
@@ -359,7 +385,7 @@ async def clean_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
     # Scan limit: How far back to check.
     # This prevents infinite loops if there are no bot messages.
-    scan_limit = 200
+    scan_limit = context.bot_data.get("clean_scan_limit", CLEAN_SCAN_LIMIT)
 
     logger.info(
         f"Starting smart cleanup. Target: {target_count}, Scan limit: {scan_limit} in chat {update.effective_chat.id}"
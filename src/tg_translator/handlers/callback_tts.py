@@ -1,10 +1,11 @@
 import logging
 import os
-import re
 
 from telegram import Message, Update
 from telegram.ext import ContextTypes
 
+from tg_translator.translator_service import CYRILLIC_RE
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,7 +44,7 @@ async def tts_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Simple heuristic for language detection to decide which voice to use
     lang = l2
-    has_cyrillic = bool(re.search(r"[а-яА-ЯёЁ]", text))
+    has_cyrillic = CYRILLIC_RE.search(text) is not None
 
     if has_cyrillic:
         # If any of the configured languages is typically Cyrillic, use it
@@ -62,10 +63,18 @@ async def tts_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             lang = "en"
         # else keep default l2
 
+    file_path = None
     try:
         file_path = await translator_service.generate_audio(text, lang, gender, chat_id)
         if file_path:
-            await message.reply_voice(voice=open(file_path, "rb"))
-            os.remove(file_path)
+            with open(file_path, "rb") as voice:
+                await message.reply_voice(voice=voice)
     except Exception as e:
         logger.error(f"TTS error: {e}")
+    finally:
+        # Remove the generated file even if sending failed
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError:
+                pass
@@ -1,16 +1,31 @@
+import asyncio
 import json
 import logging
 import shlex
+from typing import List, Optional, Tuple
 
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 
+from tg_translator.db import Database
 from tg_translator.inflector import HeuristicInflector
 
 logger = logging.getLogger(__name__)
 
 
+def _create_export(db: Database, terms: List[Tuple[str, str]]) -> Optional[str]:
+    """Serialize terms and store them as an export, returning the share code."""
+    return db.create_export(json.dumps(terms))
+
+
+def _import_terms(
+    db: Database, chat_id: int, data_str: str, lang_pair: str
+) -> Optional[int]:
+    """Parse exported JSON and add its terms, returning how many were written."""
+    return db.add_terms(chat_id, json.loads(data_str), lang_pair)
+
+
 async def dict_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle dictionary commands:
@@ -50,8 +65,10 @@ async def dict_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     # Access DB from context
     db = context.bot_data["db"]
 
-    # Get current language pair to use for dictionary operations
-    l1, l2 = db.get_languages(chat_id)
+    # Get current language pair to use for dictionary operations.
+    # SQLite calls are blocking, so they run in a worker thread to keep
+    # the event loop free for other chats.
+    l1, l2 = await asyncio.to_thread(db.get_languages, chat_id)
     langs = sorted([l1, l2])
     lang_pair = f"{langs[0]}-{langs[1]}"
 
@@ -72,18 +89,31 @@ async def dict_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         if not variations:
             variations = {source}
 
-        count = 0
-        for variant in variations:
-            if db.add_term(chat_id, variant, target, lang_pair):
-                count += 1
+        # Variants already stored with the same target are skipped by the DB
+        count = await asyncio.to_thread(
+            db.add_terms,
+            chat_id,
+            [(variant, target) for variant in variations],
+            lang_pair,
+        )
 
-        if count > 0:
+        if count is None:
+            await update.message.reply_text("Failed to add term.")
+        elif count == 0:
+            await update.message.reply_text(
+                f"Already in dictionary ({l1}-{l2}): '{source}' -> '{target}'"
+            )
+        else:
             msg = f"Added ({l1}-{l2}): '{source}' -> '{target}'"
-            if count > 1:
-                msg += f"\nAnd {count - 1} automatic variations (cases/forms)."
+            if len(variations) > 1:
+                msg += (
+                    f"\nAnd {len(variations) - 1} automatic variations (cases/forms)."
+                )
+            # count only includes rows actually written
+            skipped = len(variations) - count
+            if skipped:
+                msg += f"\n{skipped} of these forms were already in the dictionary."
             await update.message.reply_text(msg)
-        else:
-            await update.message.reply_text("Failed to add term.")
 
     elif subcommand == "remove":
         if len(args) < 3:
@@ -92,13 +122,13 @@ async def dict_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             )
             return
         source = args[2]
-        if db.remove_term(chat_id, source, lang_pair):
+        if await asyncio.to_thread(db.remove_term, chat_id, source, lang_pair):
             await update.message.reply_text(f"Removed ({l1}-{l2}): '{source}'")
         else:
             await update.message.reply_text(f"Term '{source}' not found.")
 
     elif subcommand == "list":
-        terms = db.get_terms(chat_id, lang_pair)
+        terms = await asyncio.to_thread(db.get_terms, chat_id, lang_pair)
         if not terms:
             await update.message.reply_text(f"Dictionary is empty for {l1}-{l2}.")
         else:
@@ -108,13 +138,13 @@ async def dict_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             await update.message.reply_text(msg)
 
     elif subcommand == "export":
-        terms = db.get_terms(chat_id, lang_pair)
+        terms = await asyncio.to_thread(db.get_terms, chat_id, lang_pair)
         if not terms:
             await update.message.reply_text("Dictionary is empty, nothing to export.")
             return
 
-        data = json.dumps(terms)
-        code = db.create_export(data)
+        # Encoding a large dictionary is CPU work; do it with the insert off-loop
+        code = await asyncio.to_thread(_create_export, db, terms)
         if code:
             await update.message.reply_text(
                 f"Dictionary exported! Code: <code>{code}</code>\n"
@@ -129,17 +159,17 @@ async def dict_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             await update.message.reply_text("Usage: /dict import <CODE>")
             return
         code = args[2]
-        data_str = db.get_export(code)
+        data_str = await asyncio.to_thread(db.get_export, code)
         if not data_str:
             await update.message.reply_text("Invalid or expired code.")
             return
 
         try:
-            terms = json.loads(data_str)
-            count = 0
-            for src, tgt in terms:
-                if db.add_term(chat_id, src, tgt, lang_pair):
-                    count += 1
+            count = await asyncio.to_thread(
+                _import_terms, db, chat_id, data_str, lang_pair
+            )
+            if count is None:
+                raise RuntimeError("failed to store imported terms")
             await update.message.reply_text(
                 f"Successfully imported {count} terms to {l1}-{l2} dictionary."
             )
@@ -1,3 +1,4 @@
+import asyncio
 import io
 import shlex
 
@@ -53,19 +54,19 @@ async def lang_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             )
             return
 
-        if db.set_languages(chat_id, l1, l2):
+        if await asyncio.to_thread(db.set_languages, chat_id, l1, l2):
             await update.message.reply_text(f"Languages set: {l1} <-> {l2}")
         else:
             await update.message.reply_text("Failed to set languages.")
 
     elif subcommand == "reset":
-        if db.set_languages(chat_id, "ru", "en"):
+        if await asyncio.to_thread(db.set_languages, chat_id, "ru", "en"):
             await update.message.reply_text("Languages reset to: ru <-> en")
         else:
             await update.message.reply_text("Failed to reset languages.")
 
     elif subcommand == "status":
-        l1, l2 = db.get_languages(chat_id)
+        l1, l2 = await asyncio.to_thread(db.get_languages, chat_id)
         await update.message.reply_text(f"Current languages: {l1} <-> {l2}")
 
     elif subcommand == "list":
@@ -1,12 +1,14 @@
+import asyncio
 import html
 import logging
 import os
-import re
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 
+from tg_translator.translator_service import CYRILLIC_RE, needs_translation
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,22 +20,24 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     if not update.message or not update.message.text or not update.effective_chat:
         return
 
+    original_text = update.message.text
+
+    # Ignore messages without any letters (emojis, punctuation, numbers, times):
+    # there is nothing to translate, so skip the DB lookup and the API call.
+    if not needs_translation(original_text):
+        return
+
     # Check chat mode
     db = context.bot_data["db"]
-    mode = db.get_mode(update.effective_chat.id)
+    # SQLite calls are blocking; run them off the event loop
+    mode = await asyncio.to_thread(db.get_mode, update.effective_chat.id)
     if mode == "off" or mode == "manual":
         return
 
-    original_text = update.message.text
-
-    # Ignore messages without text content (emojis-only, punctuation-only)
-    if not re.search(r"\w", original_text):
-        return
-
     if mode == "interactive":
-        l1, l2 = db.get_languages(update.effective_chat.id)
+        l1, l2 = await asyncio.to_thread(db.get_languages, update.effective_chat.id)
         # Heuristic: if Cyrillic is present, assume source is l1 (e.g. RU) -> target is l2 (EN)
-        has_cyrillic = bool(re.search(r"[а-яА-ЯёЁ]", original_text))
+        has_cyrillic = CYRILLIC_RE.search(original_text) is not None
         target_lang = l2 if has_cyrillic else l1
         label = f"🌐 to {target_lang.upper()}"
 
@@ -43,7 +47,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         # Save text to DB so callback can retrieve it even if original is deleted/inaccessible
         key = f"{update.effective_chat.id}:{sent_msg.message_id}"
-        db.add_transcription(key, original_text)
+        await asyncio.to_thread(db.add_transcription, key, original_text)
         return
 
     user = update.message.from_user
@@ -86,7 +90,7 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     # Check chat mode
     db = context.bot_data["db"]
-    mode = db.get_mode(update.effective_chat.id)
+    mode = await asyncio.to_thread(db.get_mode, update.effective_chat.id)
     if mode == "off" or mode == "manual":
         return
 
@@ -114,7 +118,9 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             logger.info(f"Transcribed text: {transcription[:50]}...")
 
             if mode == "interactive":
-                l1, l2 = db.get_languages(update.effective_chat.id)
+                l1, l2 = await asyncio.to_thread(
+                    db.get_languages, update.effective_chat.id
+                )
                 label = f"🌐 {l1.upper()}/{l2.upper()}"
 
                 # Voice case: Two buttons
@@ -136,7 +142,7 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
                 # Store transcription in DB linked to this message ID
                 key = f"{update.effective_chat.id}:{sent_msg.message_id}"
-                db.add_transcription(key, transcription)
+                await asyncio.to_thread(db.add_transcription, key, transcription)
 
                 logger.info(
                     "Sent transcription placeholder for voice message (interactive)."
@@ -147,19 +153,16 @@ async def handle_voice(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
                 transcription, update.effective_chat.id
             )
 
-            response_parts = []
-            response_parts.append(f"🎤 <i>{html.escape(transcription)}</i>")
-
+            response_text = f"🎤 <i>{html.escape(transcription)}</i>"
             if translation and translation.lower() != transcription.lower():
-                safe_translation = html.escape(translation)
-                response_parts.append(safe_translation)
+                response_text += "\n" + html.escape(translation)
 
             # TTS Button
             keyboard = [[InlineKeyboardButton("🔊 Speak", callback_data="speak")]]
             reply_markup = InlineKeyboardMarkup(keyboard)
 
             await update.message.reply_text(
-                "\n".join(response_parts),
+                response_text,
                 parse_mode=ParseMode.HTML,
                 reply_markup=reply_markup,
             )
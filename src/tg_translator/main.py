@@ -1,8 +1,12 @@
+import asyncio
 import logging
 import os
 import socket
 import sys
+import time
+from typing import Optional
 
+import httpx
 from dotenv import load_dotenv
 from telegram import (
     BotCommand,
@@ -48,9 +52,18 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+# Files in tmp/ older than this are considered abandoned and swept
+TMP_MAX_AGE_SECONDS = 600
+
+
+# Connected systemd notify socket, reused across heartbeats
+_notify_sock: Optional[socket.socket] = None
+
 
 def systemd_notify(message: str) -> None:
     """Notify systemd watchdog."""
+    global _notify_sock
+
     notify_socket = os.getenv("NOTIFY_SOCKET")
     if not notify_socket:
         return
@@ -59,11 +72,21 @@ def systemd_notify(message: str) -> None:
         notify_socket = "\0" + notify_socket[1:]
 
     try:
-        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
-            sock.connect(notify_socket)
-            sock.sendall(message.encode())
+        if _notify_sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            try:
+                sock.connect(notify_socket)
+            except OSError:
+                sock.close()
+                raise
+            _notify_sock = sock
+        _notify_sock.sendall(message.encode())
     except Exception as e:
         logger.warning(f"Failed to notify systemd: {e}")
+        # Reconnect on the next call
+        if _notify_sock is not None:
+            _notify_sock.close()
+            _notify_sock = None
 
 
 async def heartbeat_job(context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -71,25 +94,54 @@ async def heartbeat_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     systemd_notify("WATCHDOG=1")
 
 
-async def post_init(application: Application) -> None:
-    """Set up the bot's commands."""
-    # Set commands for default scope
-    await application.bot.set_my_commands(BOT_COMMANDS)
+def cleanup_tmp_dir(path: str = "tmp", max_age: float = TMP_MAX_AGE_SECONDS) -> int:
+    """Delete files in path older than max_age seconds. Returns how many were removed."""
+    removed = 0
+    cutoff = time.time() - max_age
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed += 1
+                except OSError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return removed
+
+
+async def cleanup_tmp_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Sweep leftover audio files (failed sends, crashes) from tmp/."""
+    removed = await asyncio.to_thread(cleanup_tmp_dir)
+    if removed:
+        logger.info(f"Removed {removed} stale files from tmp/")
 
-    # Set commands for private chats
-    await application.bot.set_my_commands(
-        BOT_COMMANDS, scope=BotCommandScopeAllPrivateChats()
-    )
 
-    # Set commands for group chats
-    await application.bot.set_my_commands(
-        BOT_COMMANDS, scope=BotCommandScopeAllGroupChats()
+async def post_init(application: Application) -> None:
+    """Set up the bot's commands."""
+    # The scopes are independent requests, so send them concurrently
+    await asyncio.gather(
+        # Default scope
+        application.bot.set_my_commands(BOT_COMMANDS),
+        # Private chats
+        application.bot.set_my_commands(
+            BOT_COMMANDS, scope=BotCommandScopeAllPrivateChats()
+        ),
+        # Group chats
+        application.bot.set_my_commands(
+            BOT_COMMANDS, scope=BotCommandScopeAllGroupChats()
+        ),
+        # Group chat administrators
+        application.bot.set_my_commands(
+            BOT_COMMANDS, scope=BotCommandScopeAllChatAdministrators()
+        ),
     )
 
-    # Set commands for group chat administrators
-    await application.bot.set_my_commands(
-        BOT_COMMANDS, scope=BotCommandScopeAllChatAdministrators()
-    )
+    # Sweep abandoned temp audio files (every 5 min)
+    if application.job_queue:
+        application.job_queue.run_repeating(cleanup_tmp_job, interval=300, first=60)
 
     # Set up watchdog heartbeat (every 30s)
     if os.getenv("NOTIFY_SOCKET") and application.job_queue:
@@ -115,20 +167,47 @@ def main() -> None:
         sys.exit(1)
 
     # Initialize services
-    db = Database()
+    db = Database(os.getenv("DB_PATH") or "dictionary.db")
     translator_service = TranslatorService(db=db)
 
+    # Warm up TTS/STT models in the background so the first voice request
+    # does not pay the model load time. Set TTS_PRELOAD_LANGS="" to disable.
+    preload_langs = os.getenv("TTS_PRELOAD_LANGS", "ru,en")
+    translator_service.start_preload(
+        lang.strip() for lang in preload_langs.split(",") if lang.strip()
+    )
+
     # Create the Application and pass it your bot's token.
-    # Set higher timeouts and pool size to avoid connection issues with proxy
+    # Set higher timeouts and pool size to avoid connection issues with proxy.
+    # Keep idle connections to api.telegram.org alive well past httpx's 5 s
+    # default so bursts of replies reuse them instead of redoing TLS handshakes.
     request = HTTPXRequest(
         connect_timeout=10.0,
         read_timeout=15.0,
         write_timeout=15.0,
-        pool_timeout=10.0,
+        pool_timeout=30.0,
+        media_write_timeout=60.0,  # Voice uploads (TTS replies)
         connection_pool_size=50,  # Increased from 20 to 50
+        http_version="2",
+        httpx_kwargs={
+            "limits": httpx.Limits(
+                max_connections=50,
+                max_keepalive_connections=50,
+                keepalive_expiry=75.0,
+            )
+        },
     )
+    # Process updates concurrently so a slow translation or TTS call in one
+    # chat does not hold back updates from other chats. Bounded below the
+    # HTTP pool size so concurrent handlers never wait on a free connection.
+    concurrent_updates = int(os.getenv("PTB_CONCURRENT", "32"))
     application = (
-        Application.builder().token(token).request(request).post_init(post_init).build()
+        Application.builder()
+        .token(token)
+        .request(request)
+        .post_init(post_init)
+        .concurrent_updates(concurrent_updates)
+        .build()
     )
 
     # Add error handler
@@ -165,9 +244,24 @@ def main() -> None:
     # Filter for voice messages
     application.add_handler(MessageHandler(filters.VOICE, handle_voice))
 
-    # Run the bot until the user presses Ctrl-C
-    logger.info("Starting bot...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Run the bot until the user presses Ctrl-C.
+    # With WEBHOOK_URL set (e.g. behind a reverse proxy), Telegram pushes updates
+    # to us instead of waiting on a single long-polling request.
+    webhook_url = os.getenv("WEBHOOK_URL")
+    if webhook_url:
+        logger.info(f"Starting bot in webhook mode at {webhook_url}...")
+        application.run_webhook(
+            listen=os.getenv("WEBHOOK_LISTEN", "0.0.0.0"),
+            port=int(os.getenv("PORT", "8443")),
+            url_path=token,
+            webhook_url=f"{webhook_url.rstrip('/')}/{token}",
+            allowed_updates=Update.ALL_TYPES,
+            # Telegram echoes this in a header; requests without it are rejected
+            secret_token=os.getenv("WEBHOOK_SECRET") or None,
+        )
+    else:
+        logger.info("Starting bot...")
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
 if __name__ == "__main__":
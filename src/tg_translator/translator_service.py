@@ -1,33 +1,277 @@
 import asyncio
+import io
 import logging
 import os
 import re
+import threading
 import uuid
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, Optional, cast
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, cast
 
-import soundfile as sf  # type: ignore
+import av  # type: ignore
+import numpy as np
 import torch  # type: ignore
 import torchaudio  # type: ignore
 from deep_translator import GoogleTranslator  # type: ignore
-from faster_whisper import WhisperModel  # type: ignore
+from faster_whisper import BatchedInferencePipeline, WhisperModel  # type: ignore
 from groq import Groq  # type: ignore
 from gtts import gTTS  # type: ignore
-from pydub import AudioSegment  # type: ignore
 
 from .db import Database
 
 logger = logging.getLogger(__name__)
 
+# Max number of recent translations kept in memory
+TRANSLATION_CACHE_SIZE = 1024
+# Longer texts are rarely repeated verbatim; caching them would only cost memory
+TRANSLATION_CACHE_MAX_TEXT = 2048
+# Compressed formats Groq Whisper accepts as is; re-encoding them only loses time.
+# OGG is left out on purpose: Telegram's OGG Opus is converted to MP3.
+GROQ_PASSTHROUGH_EXTENSIONS = (".mp3", ".m4a", ".webm")
+
+# Common language code aliases for user convenience
+LANGUAGE_ALIASES: Dict[str, str] = {
+    "cn": "zh-CN",
+    "ua": "uk",
+    "cz": "cs",
+    "jp": "ja",
+    "kr": "ko",
+    "rs": "sr",
+    "by": "be",
+}
+
+# Writing scripts used for translation direction detection: (pattern, languages)
+LATIN_LANGS = frozenset(
+    "en de fr es it pt nl pl cs sk sl hr bs ro hu fi sv da no is et lv lt tr az uz "
+    "id ms vi tl sq ca eu gl af sw ga cy mt eo la".split()
+)
+_SCRIPTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (r"[A-Za-z\u00c0-\u024f]", tuple(LATIN_LANGS)),
+    (r"[\u0400-\u052f]", ("ru", "uk", "be", "sr", "bg", "mk", "kk", "ky", "tg", "mn")),
+    (r"[\u0370-\u03ff]", ("el",)),
+    (r"[\u0590-\u05ff]", ("iw", "he", "yi")),
+    (r"[\u0600-\u06ff]", ("ar", "fa", "ur", "ps")),
+    (r"[\u0900-\u097f]", ("hi", "mr", "ne")),
+    (r"[\u0980-\u09ff]", ("bn",)),
+    (r"[\u0b80-\u0bff]", ("ta",)),
+    (r"[\u0e00-\u0e7f]", ("th",)),
+    (r"[\u10a0-\u10ff]", ("ka",)),
+    (r"[\u0530-\u058f]", ("hy",)),
+    (r"[\uac00-\ud7af]", ("ko",)),
+    (r"[\u3040-\u30ff]", ("ja",)),
+    (r"[\u4e00-\u9fff]", ("zh-CN", "zh-TW")),
+)
+# {lang: compiled pattern of its script}; languages sharing a script share the object
+SCRIPT_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    lang: pattern
+    for pattern, langs in ((re.compile(p), langs) for p, langs in _SCRIPTS)
+    for lang in langs
+}
+# Cyrillic and Cyrillic Supplement blocks (covers і, ї, є, ґ, ә, ң ...)
+CYRILLIC_RE = SCRIPT_PATTERNS["ru"]
+# Languages with a non-Latin script that are also commonly written in Latin
+DIGRAPHIC_LANGS = frozenset({"sr", "kk"})
+# Japanese writes many words in Han characters, so Han text does not tell ja from zh
+_CJK_LANGS = frozenset({"ja", "zh-CN", "zh-TW"})
+
+# Silero rejects very long inputs; longer texts are synthesized in chunks
+SILERO_MAX_CHUNK_CHARS = 800
+
+# Silero TTS models per language: {lang: (silero_language, model_id)}
+SILERO_MODELS: Dict[str, Tuple[str, str]] = {
+    "ru": ("ru", "v4_ru"),
+    "uk": ("ua", "v4_ua"),
+    "ua": ("ua", "v4_ua"),
+    "en": ("en", "v3_en"),
+    "de": ("de", "v3_de"),
+    "es": ("es", "v3_es"),
+    "fr": ("fr", "v3_fr"),
+}
+
+
+def _split_tts_text(text: str, limit: int) -> List[str]:
+    """
+    Split text into chunks of whole sentences, each at most limit characters
+    (a single longer sentence is kept as one chunk).
+    """
+    chunks: List[str] = []
+    current = ""
+    for sentence in re.split(r"(?<=[.!?…])\s+", text.strip()):
+        if not sentence:
+            continue
+        if current and len(current) + 1 + len(sentence) > limit:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks or [text]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the words, with common prefixes factored
+    into a trie. Optional groups are greedy, so longer words win.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End-of-word marker
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, Any]) -> str:
+    branches = [
+        re.escape(char) + _trie_node_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    body = "(?:" + "|".join(branches) + ")"
+    # A word ending here makes longer continuations optional
+    return body + "?" if "" in node else body
+
+
+def _is_whisper_wav(file_path: str) -> bool:
+    """True for 16 kHz mono 16-bit PCM WAV, which needs no conversion."""
+    with open(file_path, "rb") as f:
+        header = f.read(12)
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return False
+    try:
+        with wave.open(file_path, "rb") as w:
+            params = (w.getframerate(), w.getnchannels(), w.getsampwidth())
+            return params == (16000, 1, 2)
+    except (wave.Error, EOFError):
+        return False
+
+
+def _write_mp3(frames: Iterable["av.AudioFrame"], rate: int) -> bytes:
+    """Encode audio frames to mono MP3 at the given rate, in memory."""
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format="mp3") as dst:
+        stream = dst.add_stream("libmp3lame", rate=rate, layout="mono")
+        for frame in frames:
+            # Let the encoder assign timestamps after resampling
+            frame.pts = None
+            for packet in stream.encode(frame):
+                dst.mux(packet)
+        for packet in stream.encode(None):
+            dst.mux(packet)
+    return buffer.getvalue()
+
+
+def _encode_mp3(file_path: str) -> bytes:
+    """
+    Re-encode an audio file to 16 kHz mono MP3 in memory.
+    Uses PyAV (libav in-process) instead of forking ffmpeg; Groq resamples
+    to 16 kHz mono anyway, so downmixing here also shrinks the upload.
+    """
+    with av.open(file_path) as src:
+        return _write_mp3(src.decode(audio=0), 16000)
+
+
+def _encode_pcm_mp3(pcm: np.ndarray, sample_rate: int) -> bytes:
+    """Encode mono 16-bit PCM samples to MP3 in memory, keeping the sample rate."""
+    frame = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+    frame.sample_rate = sample_rate
+    return _write_mp3([frame], sample_rate)
+
+
+def needs_translation(text: str) -> bool:
+    """True if the text has any letters to translate."""
+    return any(ch.isalpha() for ch in text)
+
+
+def _same_text(a: str, b: str) -> bool:
+    """Case-insensitive comparison ignoring surrounding whitespace."""
+    a = a.strip()
+    b = b.strip()
+    # Differing lengths settle it without building casefolded copies
+    return len(a) == len(b) and a.casefold() == b.casefold()
+
+
+def _limit_torch_threads() -> None:
+    """Cap torch intra-op threads (process-wide) so TTS leaves cores for Whisper."""
+    torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS", "2")))
+    try:
+        # Only allowed before any inter-op work has started in the process
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    _pin_inference_thread()
+
+
+def _pin_inference_thread() -> None:
+    """
+    Pin the calling worker thread to INFERENCE_CPUS (e.g. "2,3"), if set,
+    so model inference stays off the cores used by the event loop and
+    co-hosted services. Threads it spawns later inherit the mask.
+    """
+    cpus = os.getenv("INFERENCE_CPUS")
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, {int(cpu) for cpu in cpus.split(",") if cpu.strip()})
+    except (ValueError, OSError) as e:
+        logger.warning(f"Failed to set inference CPU affinity '{cpus}': {e}")
+
 
 class TranslatorService:
     def __init__(self, db: Optional[Database] = None) -> None:
         self.db = db
-        # Executor for running synchronous translation in async context
-        self._executor = ThreadPoolExecutor(max_workers=4)
+        # Executor for blocking network calls (Google/Groq translation, Groq STT).
+        # Threads mostly wait on sockets, so the pool is sized for concurrency
+        # rather than cores; inference has its own pools below.
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("TRANSLATE_WORKERS") or 16),
+            thread_name_prefix="translate",
+        )
+        # Model inference is CPU-bound: one worker each for TTS and local STT so
+        # parallel requests queue instead of oversubscribing the cores
+        self._tts_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tts", initializer=_limit_torch_threads
+        )
+        self._stt_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stt", initializer=_pin_inference_thread
+        )
         self.whisper_model: Optional[WhisperModel] = None
+        self.whisper_pipeline: Optional[BatchedInferencePipeline] = None
+        # Supported languages {name: code}, loaded on first use
+        self._supported_languages: Optional[Dict[str, str]] = None
+        # {code.lower(): code} for case-insensitive code lookup
+        self._codes_by_lower: Dict[str, str] = {}
+        # Lowercased code -> language name, for LLM prompts
+        self._names_by_code: Dict[str, str] = {}
         # Cache for Silero TTS models: {model_id: model_object}
         self.silero_models: Dict[str, Any] = {}
+        # Per-thread GoogleTranslator instances: {target_lang: translator}
+        self._translators = threading.local()
+        # Guards model loading so concurrent first requests load a model once
+        self._model_lock = threading.Lock()
+        # Compiled custom dictionaries:
+        # {(chat_id, lang_pair): (terms, pattern, {source: target})}
+        self._dict_patterns: Dict[
+            Tuple[int, str], Tuple[Tuple[Any, ...], "re.Pattern[str]", Dict[str, str]]
+        ] = {}
+        # In-flight translations shared by concurrent identical requests:
+        # {(text, original_text, primary, secondary): future}
+        self._inflight: Dict[Tuple[str, str, str, str], "asyncio.Future[Any]"] = {}
+        # Recent successful translations (LRU), same key as _inflight
+        self._translation_cache: "OrderedDict[Tuple[str, str, str, str], str]" = (
+            OrderedDict()
+        )
+        # Cache effectiveness, logged on shutdown
+        self._cache_hits = 0
+        self._cache_misses = 0
 
         # Initialize Groq client if key is present (supports standard or user-defined env var)
         groq_key = os.getenv("GROQ_API_KEY") or os.getenv("GROK_API_KEY")
@@ -41,9 +285,36 @@ class TranslatorService:
 
     def get_supported_languages(self) -> dict[str, str]:
         """Return a dictionary of supported languages (name -> code)."""
-        return cast(
-            dict[str, str], GoogleTranslator().get_supported_languages(as_dict=True)
+        # The table is static in deep_translator, so build it once per instance
+        if self._supported_languages is None:
+            supported = cast(
+                dict[str, str],
+                GoogleTranslator().get_supported_languages(as_dict=True),
+            )
+            self._codes_by_lower = {code.lower(): code for code in supported.values()}
+            self._names_by_code = {}
+            for name, code in supported.items():
+                self._names_by_code.setdefault(code.lower(), name)
+            self._supported_languages = supported
+        return self._supported_languages
+
+    def _get_translator(self, target_lang: str) -> GoogleTranslator:
+        """
+        Return an auto-detecting GoogleTranslator for target_lang.
+        Instances are reused per thread: translate() mutates their request
+        params, so one instance must not be shared between executor threads.
+        """
+        cache: Optional[Dict[str, GoogleTranslator]] = getattr(
+            self._translators, "cache", None
         )
+        if cache is None:
+            cache = self._translators.cache = {}
+        translator = cache.get(target_lang)
+        if translator is None:
+            translator = cache[target_lang] = GoogleTranslator(
+                source="auto", target=target_lang
+            )
+        return translator
 
     def normalize_language_code(self, lang_input: str) -> Optional[str]:
         """
@@ -56,25 +327,15 @@ class TranslatorService:
 
         lang_input = lang_input.strip().lower()
 
-        # Common aliases for user convenience
-        aliases = {
-            "cn": "zh-CN",
-            "ua": "uk",
-            "cz": "cs",
-            "jp": "ja",
-            "kr": "ko",
-            "rs": "sr",
-            "by": "be",
-        }
-        if lang_input in aliases:
-            lang_input = aliases[lang_input].lower()
+        if lang_input in LANGUAGE_ALIASES:
+            lang_input = LANGUAGE_ALIASES[lang_input].lower()
 
         supported = self.get_supported_languages()
 
         # 1. Check against codes (values) case-insensitively
-        for code in supported.values():
-            if code.lower() == lang_input:
-                return code
+        code = self._codes_by_lower.get(lang_input)
+        if code:
+            return code
 
         # 2. Check against names (keys) case-insensitively
         # deep_translator keys are typically lowercase
@@ -89,12 +350,8 @@ class TranslatorService:
 
     def _get_language_name(self, code: str) -> str:
         """Convert code (ru) to name (russian) for LLM prompts."""
-        supported = self.get_supported_languages()
-        # supported is {name: code}
-        for name, c in supported.items():
-            if c.lower() == code.lower():
-                return name
-        return code
+        self.get_supported_languages()
+        return self._names_by_code.get(code.lower(), code)
 
     def _translate_groq_sync(
         self, text: str, source_lang: str, target_lang: str
@@ -137,33 +394,69 @@ class TranslatorService:
         if not self.groq_client:
             return None
 
-        temp_mp3 = None
         try:
-            # Convert OGG (Telegram) to MP3 for better API compatibility
-            # Telegram uses OGG Opus, which some APIs reject.
-            # Conversion is fast and safe.
-            temp_mp3 = file_path + ".mp3"
-            AudioSegment.from_ogg(file_path).export(temp_mp3, format="mp3")
-
-            with open(temp_mp3, "rb") as file:
-                # Groq Whisper API (OpenAI compatible)
-                transcription = self.groq_client.audio.transcriptions.create(
-                    file=(os.path.basename(temp_mp3), file.read()),
-                    model="whisper-large-v3",
-                    # prompt="Optional prompt to guide style"
-                )
-                return transcription.text.strip()  # type: ignore
+            if file_path.lower().endswith(
+                GROQ_PASSTHROUGH_EXTENSIONS
+            ) or _is_whisper_wav(file_path):
+                # Already accepted by the API (e.g. /stt uploads): send as is
+                with open(file_path, "rb") as f:
+                    upload = (os.path.basename(file_path), f.read())
+            else:
+                # Convert OGG (Telegram) to MP3 for better API compatibility
+                # Telegram uses OGG Opus, which some APIs reject.
+                # The MP3 is kept in memory: it is uploaded once and never reused.
+                upload = (os.path.basename(file_path) + ".mp3", _encode_mp3(file_path))
+
+            # Groq Whisper API (OpenAI compatible)
+            transcription = self.groq_client.audio.transcriptions.create(
+                file=upload,
+                model="whisper-large-v3",
+                # prompt="Optional prompt to guide style"
+            )
+            return transcription.text.strip()  # type: ignore
 
         except Exception as e:
             logger.error(f"Groq Whisper transcription error: {e}")
             return None
-        finally:
-            # Cleanup temp MP3
-            if temp_mp3 and os.path.exists(temp_mp3):
-                try:
-                    os.remove(temp_mp3)
-                except Exception:
-                    pass
+
+    @staticmethod
+    def _detect_source_is_primary(
+        text: str, primary_lang: str, secondary_lang: str
+    ) -> Optional[bool]:
+        """
+        Guess whether text is in the primary language from its script alone.
+        Returns None when the script is not conclusive.
+        """
+        primary_script = SCRIPT_PATTERNS.get(primary_lang)
+        if primary_script is None:
+            return None
+
+        # Kana/Han overlap: mixed Japanese matches the Chinese script as well
+        if primary_lang in _CJK_LANGS and secondary_lang in _CJK_LANGS:
+            return None
+
+        if not primary_script.search(text):
+            # Only text in the secondary script proves the source is not primary;
+            # anything else (kanji-only Japanese, a third script) needs the probe
+            secondary_script = SCRIPT_PATTERNS.get(secondary_lang)
+            if secondary_script is None or not secondary_script.search(text):
+                return None
+            # Latin-script Serbian looks like any other Latin text
+            if primary_lang in DIGRAPHIC_LANGS and secondary_lang in LATIN_LANGS:
+                return None
+            if primary_lang == "ja" and SCRIPT_PATTERNS["zh-CN"].search(text):
+                return None
+            return False
+
+        # Latin is shared by too many languages to identify the primary one
+        if primary_lang in LATIN_LANGS:
+            return None
+
+        # A non-Latin primary script wins even in mixed text (e.g. Russian with an
+        # English brand name), unless both languages share it (ru/uk, ar/fa)
+        if SCRIPT_PATTERNS.get(secondary_lang) is primary_script:
+            return None
+        return True
 
     def _translate_sync(
         self,
@@ -179,15 +472,12 @@ class TranslatorService:
             # Determine direction based on original text (to handle dictionary substitutions)
             sample_text = original_text if original_text else text
 
-            # Heuristic: If primary lang implies Cyrillic, and text has Cyrillic -> Source IS Primary.
-            # This avoids API call and fixes the dictionary bug.
-            cyrillic_langs = {"ru", "uk", "be", "sr", "bg", "mk", "kk", "ky", "tg"}
-            is_source_primary = None
-
-            if primary_lang in cyrillic_langs and bool(
-                re.search(r"[а-яА-ЯёЁ]", sample_text)
-            ):
-                is_source_primary = True
+            # Heuristic: decide direction from the writing script when possible.
+            # This avoids an API call and fixes the dictionary bug.
+            is_source_primary = self._detect_source_is_primary(
+                sample_text, primary_lang, secondary_lang
+            )
+            res_prim: Optional[str] = None
 
             if is_source_primary is None:
                 # Strategy:
@@ -195,14 +485,12 @@ class TranslatorService:
                 # 2. If it changes, Source is likely Secondary (or Third). Target -> Primary.
                 # 3. If it stays same, Source is likely Primary. Target -> Secondary.
 
-                to_primary = GoogleTranslator(source="auto", target=primary_lang)
+                to_primary = self._get_translator(primary_lang)
                 # Deep-translator doesn't have a reliable built-in timeout in all versions
                 # so we rely on the thread pool executor and global app timeouts
                 res_prim = cast(str, to_primary.translate(sample_text))
 
-                is_source_primary = False
-                if res_prim and res_prim.lower().strip() == sample_text.lower().strip():
-                    is_source_primary = True
+                is_source_primary = bool(res_prim) and _same_text(res_prim, sample_text)
 
             target_lang = secondary_lang if is_source_primary else primary_lang
 
@@ -218,11 +506,11 @@ class TranslatorService:
                 # If Groq fails (returns None), fall through to Google Translate
 
             # Optimization: If target is Primary and we haven't modified text, return result
-            if target_lang == primary_lang and text == sample_text:
+            if target_lang == primary_lang and text == sample_text and res_prim:
                 return res_prim
 
             # 5. Fallback: Translate actual text to determined target using Google
-            translator = GoogleTranslator(source="auto", target=target_lang)
+            translator = self._get_translator(target_lang)
             result = cast(str, translator.translate(text))
             return result
 
@@ -231,29 +519,56 @@ class TranslatorService:
             return None
 
     def _apply_custom_dictionary(
-        self, text: str, chat_id: Optional[int], lang_pair: str = "ru-en"
+        self,
+        text: str,
+        chat_id: Optional[int],
+        lang_pair: str = "ru-en",
+        terms: Optional[List[Tuple[str, str]]] = None,
     ) -> str:
         if not self.db or chat_id is None:
             return text
 
-        terms = self.db.get_terms(chat_id, lang_pair)
+        # Callers that already loaded the terms pass them in
+        if terms is None:
+            terms = self.db.get_terms(chat_id, lang_pair)
         if not terms:
             return text
 
-        # Sort by length of source term (descending) to match longest phrases first
-        terms.sort(key=lambda x: len(x[0]), reverse=True)
-
-        processed_text = text
-        for source, target in terms:
-            # Create a regex for case-insensitive replacement with word boundaries
-            # escaping source to handle special regex chars
+        # Reuse the compiled pattern while the chat's terms are unchanged
+        key = (chat_id, lang_pair)
+        terms_key = tuple(terms)
+        cached = self._dict_patterns.get(key)
+        if cached is None or cached[0] != terms_key:
+            # One trie-shaped pattern: shared prefixes are matched once, so the
+            # cost per text position follows term length, not the term count.
+            # Sources are stored lower-cased, so the matched text maps back by lower().
             try:
-                pattern = re.compile(r"\b" + re.escape(source) + r"\b", re.IGNORECASE)
-                processed_text = pattern.sub(target, processed_text)
+                pattern = re.compile(
+                    r"\b(?:" + _trie_pattern(source for source, _ in terms) + r")\b",
+                    re.IGNORECASE,
+                )
             except Exception as e:
-                logger.error(f"Regex error for term '{source}': {e}")
-
-        return processed_text
+                logger.error(f"Regex error for dictionary of chat {chat_id}: {e}")
+                return text
+            cached = (terms_key, pattern, dict(terms))
+            self._dict_patterns[key] = cached
+
+        _, pattern, mapping = cached
+        # Single pass over the text; targets are inserted literally
+        return pattern.sub(lambda m: mapping.get(m.group(0).lower(), m.group(0)), text)
+
+    def _on_translation_done(
+        self, key: Tuple[str, str, str, str], fut: "asyncio.Future[Any]"
+    ) -> None:
+        """Release the in-flight entry and remember successful results."""
+        self._inflight.pop(key, None)
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        result = fut.result()
+        if result and len(key[1]) <= TRANSLATION_CACHE_MAX_TEXT:
+            self._translation_cache[key] = result
+            if len(self._translation_cache) > TRANSLATION_CACHE_SIZE:
+                self._translation_cache.popitem(last=False)
 
     async def translate_message(
         self, text: str, chat_id: Optional[int] = None
@@ -264,36 +579,62 @@ class TranslatorService:
         if not text or not text.strip():
             return None
 
+        # Numbers, emoji and punctuation come back unchanged: skip DB and API
+        if not needs_translation(text):
+            return text
+
         # Defaults
         primary = "ru"
         secondary = "en"
+        terms: List[Tuple[str, str]] = []
 
         if self.db and chat_id:
-            primary, secondary = self.db.get_languages(chat_id)
+            # Language pair and dictionary in a single DB round trip, run in a
+            # worker thread so the blocking SQLite read does not stall the loop
+            primary, secondary, terms = await asyncio.to_thread(
+                self.db.get_chat_translation_settings, chat_id
+            )
 
         # Construct language pair string for dictionary lookup (alphabetical order)
         langs = sorted([primary, secondary])
         lang_pair = f"{langs[0]}-{langs[1]}"
 
         # Apply dictionary substitutions before translation
-        text_to_translate = self._apply_custom_dictionary(text, chat_id, lang_pair)
-
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            self._executor,
-            self._translate_sync,
-            text_to_translate,
-            primary,
-            secondary,
-            text,  # original_text
+        text_to_translate = self._apply_custom_dictionary(
+            text, chat_id, lang_pair, terms
         )
 
+        # Single-flight: identical concurrent requests (e.g. a quote forwarded to
+        # several chats) share one upstream call instead of issuing N of them.
+        key = (text_to_translate, text, primary, secondary)
+        cached = self._translation_cache.get(key)
+        if cached is not None:
+            self._translation_cache.move_to_end(key)
+            self._cache_hits += 1
+            return cached
+        self._cache_misses += 1
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(
+                self._executor,
+                self._translate_sync,
+                text_to_translate,
+                primary,
+                secondary,
+                text,  # original_text
+            )
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda fut: self._on_translation_done(key, fut))
+
+        # Shield so a cancelled caller does not cancel the call for the others
+        return cast(Optional[str], await asyncio.shield(pending))
+
     def _translate_direct_sync(self, text: str, target_lang: str) -> str:
         """Simple direct translation without direction detection."""
         try:
-            return cast(
-                str, GoogleTranslator(source="auto", target=target_lang).translate(text)
-            )
+            return cast(str, self._get_translator(target_lang).translate(text))
         except Exception as e:
             logger.error(f"Direct translation error: {e}")
             return text
@@ -308,6 +649,51 @@ class TranslatorService:
             self._executor, self._translate_direct_sync, text, target_lang
         )
 
+    def _get_silero_model(self, lang: str) -> Optional[Any]:
+        """
+        Return the Silero TTS model for a language, loading it on first use.
+        Returns None if the language has no Silero model.
+        """
+        params = SILERO_MODELS.get(lang.lower())
+        if not params:
+            return None
+        language, model_id = params
+
+        with self._model_lock:
+            if model_id not in self.silero_models:
+                logger.info(f"Loading Silero TTS model: {model_id} ({language})")
+                model, _ = torch.hub.load(
+                    repo_or_dir="snakers4/silero-models",
+                    model="silero_tts",
+                    language=language,
+                    speaker=model_id,
+                )
+                model.to(torch.device("cpu"))
+                self.silero_models[model_id] = model
+            return self.silero_models[model_id]
+
+    def preload_models(self, tts_langs: Iterable[str]) -> None:
+        """
+        Load models ahead of the first request so it does not pay the load time.
+        Local Whisper is only preloaded when Groq STT is not configured.
+        """
+        for lang in tts_langs:
+            try:
+                self._get_silero_model(lang)
+            except Exception as e:
+                logger.error(f"Failed to preload Silero model for {lang}: {e}")
+
+        if not self.groq_client:
+            try:
+                self._get_whisper_model()
+            except Exception as e:
+                logger.error(f"Failed to preload Whisper model: {e}")
+
+    def start_preload(self, tts_langs: Iterable[str]) -> "Future[None]":
+        """Preload models in the background without blocking startup."""
+        # Runs on the TTS worker so it never occupies a translation thread
+        return self._tts_executor.submit(self.preload_models, list(tts_langs))
+
     def _generate_audio_silero_sync(
         self,
         text: str,
@@ -325,7 +711,6 @@ class TranslatorService:
             # We use snakers4/silero-models repository logic
             lang_code = lang.lower()
             speaker = None
-            model_id = None
 
             if speaker_override:
                 speaker = speaker_override
@@ -372,65 +757,39 @@ class TranslatorService:
                     else:
                         speaker = "fr_0"
 
-            # Determine model_id based on lang_code (presets only store speaker name)
-            if lang_code == "ru":
-                model_id = "v4_ru"
-            elif lang_code in ["uk", "ua"]:
-                lang_code = "ua"
-                model_id = "v4_ua"
-            elif lang_code == "en":
-                model_id = "v3_en"
-            elif lang_code == "de":
-                model_id = "v3_de"
-            elif lang_code == "es":
-                model_id = "v3_es"
-            elif lang_code == "fr":
-                model_id = "v3_fr"
-            else:
+            # Determine model based on lang_code (presets only store speaker name)
+            model = self._get_silero_model(lang_code)
+            if model is None:
                 # Language not supported by our Silero config, fallback to gTTS
                 return None
 
-            device = torch.device("cpu")
-
-            # Lazy load model
-            if model_id not in self.silero_models:
-                logger.info(f"Loading Silero TTS model: {model_id} ({lang_code})")
-                model, _ = torch.hub.load(
-                    repo_or_dir="snakers4/silero-models",
-                    model="silero_tts",
-                    language=lang_code,
-                    speaker=model_id,
-                )
-                model.to(device)
-                self.silero_models[model_id] = model
-
-            model = self.silero_models[model_id]
-
             # Generate audio (Tensor)
-            # sample_rate 48000 is standard for v4 models
+            # sample_rate 48000 is standard for v4 models.
+            # inference_mode skips autograd bookkeeping entirely (cheaper than no_grad).
+            # Long texts are synthesized sentence by sentence and concatenated.
             sample_rate = 48000
-            audio = model.apply_tts(
-                text=text,
-                speaker=speaker,
-                sample_rate=sample_rate,
-                put_accent=True,
-                put_yo=True,
-            )
-
-            # Save to temporary WAV file
-            os.makedirs("tmp", exist_ok=True)
-            wav_filename = f"tmp/tts_silero_{uuid.uuid4()}.wav"
-
-            # Audio is 1D tensor [samples]. Save using soundfile (numpy array).
-            sf.write(wav_filename, audio.numpy(), sample_rate)
+            with torch.inference_mode():
+                parts = [
+                    model.apply_tts(
+                        text=chunk,
+                        speaker=speaker,
+                        sample_rate=sample_rate,
+                        put_accent=True,
+                        put_yo=True,
+                    )
+                    for chunk in _split_tts_text(text, SILERO_MAX_CHUNK_CHARS)
+                ]
+            audio = parts[0] if len(parts) == 1 else torch.cat(parts)
 
-            # Convert to MP3 using pydub for compatibility/size
-            mp3_filename = wav_filename.replace(".wav", ".mp3")
-            AudioSegment.from_wav(wav_filename).export(mp3_filename, format="mp3")
+            # Audio is a 1D float tensor [samples] in [-1, 1]. Convert to 16-bit PCM
+            # and encode it in-process with PyAV: no intermediate WAV, no ffmpeg fork.
+            pcm = (audio.clamp(-1.0, 1.0) * 32767).to(torch.int16).numpy()
+            mp3_data = _encode_pcm_mp3(pcm, sample_rate)
 
-            # Cleanup WAV
-            if os.path.exists(wav_filename):
-                os.remove(wav_filename)
+            os.makedirs("tmp", exist_ok=True)
+            mp3_filename = f"tmp/tts_silero_{uuid.uuid4()}.mp3"
+            with open(mp3_filename, "wb") as f:
+                f.write(mp3_data)
 
             return mp3_filename
 
@@ -483,7 +842,7 @@ class TranslatorService:
         """
         loop = asyncio.get_running_loop()
         return await loop.run_in_executor(
-            self._executor,
+            self._tts_executor,
             self._generate_audio_sync,
             text,
             lang,
@@ -498,12 +857,21 @@ class TranslatorService:
         Configured for 4-core server hosting LiveKit alongside.
         cpu_threads=2 ensures we don't starve other processes.
         """
-        if self.whisper_model is None:
-            logger.info("Loading Whisper model (small, int8)...")
-            self.whisper_model = WhisperModel(
-                "small", device="cpu", compute_type="int8", cpu_threads=2
-            )
-        return self.whisper_model
+        with self._model_lock:
+            if self.whisper_model is None:
+                logger.info("Loading Whisper model (small, int8)...")
+                self.whisper_model = WhisperModel(
+                    "small", device="cpu", compute_type="int8", cpu_threads=2
+                )
+                self.whisper_pipeline = BatchedInferencePipeline(
+                    model=self.whisper_model
+                )
+            return self.whisper_model
+
+    def _get_whisper_pipeline(self) -> BatchedInferencePipeline:
+        """Batched (VAD-chunked) inference pipeline over the Whisper model."""
+        self._get_whisper_model()
+        return cast(BatchedInferencePipeline, self.whisper_pipeline)
 
     def _transcribe_sync(self, file_path: str) -> Optional[str]:
         """
@@ -511,9 +879,17 @@ class TranslatorService:
         Directly accepts OGG (Telegram voice) via ffmpeg backend.
         """
         try:
-            model = self._get_whisper_model()
-            # beam_size=5 provides better accuracy than greedy search
-            segments, info = model.transcribe(file_path, beam_size=5)
+            pipeline = self._get_whisper_pipeline()
+            # Voice notes are short: greedy decoding is several times cheaper than
+            # beam search for little quality loss, and VAD skips silent frames.
+            segments, info = pipeline.transcribe(
+                file_path,
+                batch_size=8,
+                beam_size=1,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=500),
+                condition_on_previous_text=False,
+            )
 
             # Segments is a generator, iteration triggers processing
             text = " ".join([segment.text for segment in segments]).strip()
@@ -542,9 +918,15 @@ class TranslatorService:
 
         # 2. Fallback to Local Whisper (RAM heavy)
         return await loop.run_in_executor(
-            self._executor, self._transcribe_sync, file_path
+            self._stt_executor, self._transcribe_sync, file_path
         )
 
     def shutdown(self) -> None:
         """Cleanup resources."""
+        logger.info(
+            f"Translation cache: {self._cache_hits} hits, {self._cache_misses} misses, "
+            f"{len(self._translation_cache)} entries"
+        )
         self._executor.shutdown(wait=True)
+        self._tts_executor.shutdown(wait=True)
+        self._stt_executor.shutdown(wait=True)
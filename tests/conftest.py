@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import threading
+import uuid
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+# tg_translator.api builds its Database at import time. Point it at a shared
+# in-memory DB, kept alive by this connection, so tests never write dictionary.db.
+API_DB_PATH = "file:api_tests?mode=memory&cache=shared"
+_api_db_keeper = sqlite3.connect(API_DB_PATH, uri=True)
+os.environ["DB_PATH"] = API_DB_PATH
+
+
+@pytest_asyncio.fixture(scope="session")
+async def aclient():
+    """API client shared by the session; requests run in the test event loop."""
+    # Imported here so test modules that never touch the API skip its setup
+    from tg_translator.api import app
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def module_service():
+    """One TranslatorService per test module, built without a Groq key."""
+    from tg_translator.translator_service import TranslatorService
+
+    with patch("tg_translator.translator_service.os.getenv", return_value=None):
+        service = TranslatorService()
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def service(module_service, monkeypatch):
+    """
+    The module's service with per-test state cleared.
+    Tests override attributes through monkeypatch so they are undone afterwards.
+    """
+    module_service._supported_languages = None
+    module_service._codes_by_lower.clear()
+    module_service._names_by_code.clear()
+    module_service._translators = threading.local()
+    module_service._translation_cache.clear()
+    module_service._dict_patterns.clear()
+    module_service._inflight.clear()
+    module_service.silero_models.clear()
+    module_service._cache_hits = module_service._cache_misses = 0
+    for attr in ("db", "groq_client", "whisper_model", "whisper_pipeline"):
+        monkeypatch.setattr(module_service, attr, None)
+    return module_service
+
+
+@pytest.fixture
+def db():
+    """
+    Shared-cache in-memory DB, private to one test. Database opens a new
+    connection per operation, so one connection is held open to keep the
+    DB alive between them; no file, journal or fsync is involved.
+    """
+    from tg_translator.db import Database
+
+    # A random name: test ids may contain "?" or "#", which would break the URI
+    db_path = f"file:test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(db_path, uri=True)
+    yield Database(db_path)
+    keeper.close()
@@ -4,10 +4,18 @@ import pytest
 from telegram import Chat, Message, Update
 from telegram.ext import ContextTypes
 
+from tg_translator.handlers import admin
 from tg_translator.handlers.admin import help_command, start_command, voice_command
 
 
-@pytest.mark.asyncio
+@pytest.fixture(autouse=True)
+def reset_scope_refresh():
+    """Each test starts with no chat recently refreshed."""
+    admin._scope_refreshed.clear()
+    yield
+    admin._scope_refreshed.clear()
+
+
 async def test_start_command_refreshes_scope():
     """
     Verify that start_command refreshes bot commands for the chat scope.
@@ -38,7 +46,6 @@ async def test_start_command_refreshes_scope():
     update.message.reply_text.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_help_command_refreshes_scope():
     """
     Verify that help_command refreshes bot commands for the chat scope.
@@ -64,7 +71,35 @@ async def test_help_command_refreshes_scope():
     update.message.reply_text.assert_called_once()
 
 
-@pytest.mark.asyncio
+async def test_scope_refresh_skipped_within_ttl(monkeypatch):
+    """
+    Verify that repeated /start and /help in one chat refresh commands once per TTL.
+    """
+    update = MagicMock(spec=Update)
+    update.effective_chat = MagicMock(spec=Chat)
+    update.effective_chat.id = 12345
+    update.message = MagicMock(spec=Message)
+    update.message.reply_text = AsyncMock()
+
+    context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+    context.bot = MagicMock()
+    context.bot.set_my_commands = AsyncMock()
+    context.bot_data = {"db": MagicMock()}
+
+    now = 1000.0
+    monkeypatch.setattr(admin.time, "monotonic", lambda: now)
+
+    await start_command(update, context)
+    await help_command(update, context)
+    assert context.bot.set_my_commands.call_count == 1
+    # Replies are never skipped
+    assert update.message.reply_text.call_count == 2
+
+    now += admin.SCOPE_REFRESH_TTL
+    await help_command(update, context)
+    assert context.bot.set_my_commands.call_count == 2
+
+
 async def test_voice_command_no_scope_refresh():
     """
     Verify that voice_command no longer attempts to refresh bot commands.
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from telegram import Message
+
+from tg_translator.handlers.callback_tts import tts_callback
+
+
+def make_update(text: str, chat_id: int = 12345) -> SimpleNamespace:
+    """Callback query for the TTS button under a bot message with `text`."""
+    message = MagicMock(spec=Message)
+    message.text = text
+    message.chat_id = chat_id
+    message.reply_voice = AsyncMock()
+    return SimpleNamespace(
+        callback_query=SimpleNamespace(answer=AsyncMock(), message=message)
+    )
+
+
+def make_context(audio_path) -> SimpleNamespace:
+    db = MagicMock()
+    db.get_languages.return_value = ("ru", "en")
+    db.get_voice_gender.return_value = "male"
+    translator_service = SimpleNamespace(
+        generate_audio=AsyncMock(return_value=str(audio_path))
+    )
+    return SimpleNamespace(
+        bot_data={"db": db, "translator_service": translator_service}
+    )
+
+
+async def test_tts_callback_sends_and_removes_audio(tmp_path):
+    audio = tmp_path / "tts.mp3"
+    audio.write_bytes(b"mp3 data")
+    update = make_update("Привет")
+    context = make_context(audio)
+
+    await tts_callback(update, context)
+
+    context.bot_data["translator_service"].generate_audio.assert_called_once_with(
+        "Привет", "ru", "male", 12345
+    )
+    update.callback_query.message.reply_voice.assert_called_once()
+    assert not audio.exists()
+
+
+async def test_tts_callback_removes_audio_when_send_fails(tmp_path):
+    """The generated file is deleted even if Telegram rejects the upload."""
+    audio = tmp_path / "tts.mp3"
+    audio.write_bytes(b"mp3 data")
+    update = make_update("Hello")
+    update.callback_query.message.reply_voice.side_effect = RuntimeError("timeout")
+    context = make_context(audio)
+
+    await tts_callback(update, context)
+
+    update.callback_query.message.reply_voice.assert_called_once()
+    assert not audio.exists()
@@ -1,31 +1,31 @@
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
-import pytest
-from telegram import Chat, Message, Update
-from telegram.ext import ContextTypes
+from telegram.error import BadRequest
 
 from tg_translator.handlers.admin import clean_command
 
+# Raised for messages the bot may not delete; built once and reused by the mocks
+_DELETE_ERR = BadRequest("Message can't be deleted")
+
 
-@pytest.mark.asyncio
 async def test_clean_command_smart_logic():
     """
     Test that clean_command skips un-deletable messages (user messages)
     and continues scanning until target_count is met.
     """
-    # Setup
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-
-    # Command message
-    update.message = AsyncMock(spec=Message)
-    update.message.message_id = 100
-    update.message.delete = AsyncMock()  # Command itself should be deleted
-
-    context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-    context.args = ["2"]  # Target deletion count: 2 messages
-    context.bot.delete_message = AsyncMock()
+    # Setup: plain namespaces carry only what clean_command reads
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        # Command message; the command itself should be deleted
+        message=SimpleNamespace(message_id=100, delete=AsyncMock()),
+    )
+
+    context = SimpleNamespace(
+        args=["2"],  # Target deletion count: 2 messages
+        bot_data={},
+        bot=SimpleNamespace(delete_message=AsyncMock()),
+    )
 
     # Simulation Logic:
     # ID 99: User message (raise Exception)
@@ -36,7 +36,7 @@ async def test_clean_command_smart_logic():
 
     async def delete_side_effect(chat_id, message_id):
         if message_id in [99, 97]:
-            raise Exception("Message can't be deleted")
+            raise _DELETE_ERR
         if message_id in [98, 96, 95]:
             return True
         return False
@@ -50,57 +50,35 @@ async def test_clean_command_smart_logic():
     # 1. Verify command message deletion was attempted
     update.message.delete.assert_called_once()
 
-    # 2. Verify attempts on specific IDs
-    # Expected calls: 99, 98, 97, 96
-    expected_calls = [
-        ((12345, 99),),
-        ((12345, 98),),
-        ((12345, 97),),
-        ((12345, 96),),
-    ]
-
-    # Check actual calls to delete_message
-    # Note: call_args_list items are (args, kwargs) tuples.
-    # We called it as delete_message(chat_id=..., message_id=...) usually,
-    # but the code uses positional or keyword?
+    # 2. Verify attempts on specific IDs: 99, 98, 97, 96.
+    # ID 95 must NOT be attempted because the target was reached.
     # Code: await context.bot.delete_message(chat_id=chat_id, message_id=target_id)
-
     assert context.bot.delete_message.call_count == 4
+    ids = {c.kwargs["message_id"] for c in context.bot.delete_message.call_args_list}
+    assert ids == {96, 97, 98, 99}
 
-    # Verify ID 95 was NOT attempted because target reached
-    call_args = [
-        c.kwargs["message_id"] for c in context.bot.delete_message.call_args_list
-    ]
-    assert 99 in call_args
-    assert 98 in call_args
-    assert 97 in call_args
-    assert 96 in call_args
-    assert 95 not in call_args
 
-
-@pytest.mark.asyncio
 async def test_clean_command_scan_limit():
     """
     Test that clean_command respects scan_limit even if target not reached.
     """
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-    update.message = AsyncMock(spec=Message)
-    update.message.message_id = 1000
-
-    context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-    context.args = ["50"]  # High target
-    # Always fail deletion
-    context.bot.delete_message = AsyncMock(side_effect=Exception("Fail"))
-
-    # In code scan_limit is hardcoded to 200.
-    # To avoid running loop 200 times in test, we assume code works,
-    # but checking 200 calls is fine for a unit test.
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        message=SimpleNamespace(message_id=1000, delete=AsyncMock()),
+    )
+
+    context = SimpleNamespace(
+        args=["50"],  # High target
+        # A small limit keeps the test to a handful of awaits
+        bot_data={"clean_scan_limit": 10},
+        # Always fail deletion
+        bot=SimpleNamespace(delete_message=AsyncMock(side_effect=_DELETE_ERR)),
+    )
 
     # Act
     await clean_command(update, context)
 
     # Assert
-    # Should scan exactly 200 times (from 999 down to 800)
-    assert context.bot.delete_message.call_count == 200
+    # Should scan exactly 10 times (from 999 down to 990)
+    assert context.bot.delete_message.call_count == 10
+    assert context.bot.delete_message.call_args.kwargs["message_id"] == 990
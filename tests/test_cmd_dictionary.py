@@ -0,0 +1,141 @@
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tg_translator.handlers.admin import status_command
+from tg_translator.handlers.cmd_dictionary import dict_command
+from tg_translator.handlers.cmd_settings import lang_command
+from tg_translator.handlers.translation import handle_message
+
+
+def make_update(text: str, chat_id: int = 12345) -> SimpleNamespace:
+    """Minimal stand-in for a PTB Update carrying a /dict command."""
+    return SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id),
+        message=SimpleNamespace(text=text, reply_text=AsyncMock()),
+    )
+
+
+def reply_of(update: SimpleNamespace) -> str:
+    update.message.reply_text.assert_called_once()
+    return update.message.reply_text.call_args[0][0]
+
+
+async def test_dict_add_reports_variations(db):
+    """All generated forms are stored and counted as variations."""
+    context = SimpleNamespace(bot_data={"db": db})
+    update = make_update("/dict add кот cat")
+
+    await dict_command(update, context)
+
+    reply = reply_of(update)
+    assert "Added (ru-en): 'кот' -> 'cat'" in reply
+    assert "And 4 automatic variations" in reply
+    assert "already" not in reply
+    assert len(db.get_terms(12345, "en-ru")) == 5
+
+
+async def test_dict_add_counts_existing_forms(db):
+    """Forms already stored are reported, not subtracted from the variations."""
+    db.add_terms(12345, [("кота", "cat"), ("коту", "cat")], "en-ru")
+    context = SimpleNamespace(bot_data={"db": db})
+    update = make_update("/dict add кот cat")
+
+    await dict_command(update, context)
+
+    reply = reply_of(update)
+    assert "And 4 automatic variations" in reply
+    assert "2 of these forms were already in the dictionary." in reply
+
+
+async def test_dict_add_already_in_dictionary(db):
+    """Adding the same term twice writes nothing the second time."""
+    context = SimpleNamespace(bot_data={"db": db})
+    await dict_command(make_update("/dict add cat кот"), context)
+
+    update = make_update("/dict add cat кот")
+    await dict_command(update, context)
+
+    assert reply_of(update) == "Already in dictionary (ru-en): 'cat' -> 'кот'"
+    assert db.get_terms(12345, "en-ru") == [("cat", "кот")]
+
+
+class ThreadRecordingDB:
+    """Wraps a Database and records the thread each call runs in."""
+
+    def __init__(self, db):
+        self._db = db
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self._db, name)
+
+        def wrapper(*args, **kwargs):
+            self.calls.append((name, threading.get_ident()))
+            return method(*args, **kwargs)
+
+        return wrapper
+
+
+@pytest.mark.parametrize(
+    "handler,text",
+    [
+        (dict_command, "/dict add кот cat"),
+        (dict_command, "/dict list"),
+        (dict_command, "/dict export"),
+        (lang_command, "/lang set ru es"),
+        (lang_command, "/lang status"),
+        (status_command, "/status"),
+    ],
+)
+async def test_db_calls_run_off_event_loop(db, handler, text):
+    """Blocking sqlite calls must not run on the event loop thread."""
+    db.add_terms(12345, [("пёс", "dog")], "en-ru")
+    recording = ThreadRecordingDB(db)
+    context = SimpleNamespace(
+        bot_data={
+            "db": recording,
+            "translator_service": SimpleNamespace(
+                normalize_language_code=lambda code: code
+            ),
+        }
+    )
+
+    await handler(make_update(text), context)
+
+    assert recording.calls
+    loop_thread = threading.get_ident()
+    assert all(thread != loop_thread for _, thread in recording.calls)
+
+
+@pytest.mark.parametrize("mode", ["auto", "interactive"])
+async def test_handle_message_db_calls_run_off_event_loop(
+    db, service, monkeypatch, mode
+):
+    """Per-message DB reads and writes, including the translator's, stay off-loop."""
+    db.set_mode(12345, mode)
+    recording = ThreadRecordingDB(db)
+    monkeypatch.setattr(service, "db", recording)
+    monkeypatch.setattr(service, "_translate_sync", lambda *args: "Hello")
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        message=SimpleNamespace(
+            text="Привет",
+            from_user=SimpleNamespace(username="testuser"),
+            reply_text=AsyncMock(return_value=SimpleNamespace(message_id=999)),
+        ),
+    )
+    context = SimpleNamespace(bot_data={"db": recording, "translator_service": service})
+
+    await handle_message(update, context)
+
+    update.message.reply_text.assert_called_once()
+    called = {name for name, _ in recording.calls}
+    if mode == "auto":
+        assert "get_chat_translation_settings" in called
+    else:
+        assert "add_transcription" in called
+    loop_thread = threading.get_ident()
+    assert all(thread != loop_thread for _, thread in recording.calls)
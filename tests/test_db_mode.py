@@ -1,117 +1,121 @@
-import os
-import tempfile
-import unittest
+import pytest
 
-from tg_translator.db import Database
 
+def test_default_mode(db):
+    """Test that a new chat has 'auto' mode by default."""
+    # Querying a non-existent chat should return default
+    assert db.get_mode(12345) == "auto"
 
-class TestDatabaseMode(unittest.TestCase):
-    def setUp(self):
-        # Use a temporary file to persist state across multiple connections
-        self.db_fd, self.db_path = tempfile.mkstemp()
-        self.db = Database(self.db_path)
 
-    def tearDown(self):
-        os.close(self.db_fd)
-        os.remove(self.db_path)
+@pytest.mark.parametrize("mode", ["manual", "auto", "interactive"])
+def test_set_get_mode(db, mode):
+    """Test setting and retrieving modes."""
+    chat_id = 67890
+    assert db.set_mode(chat_id, mode), f"Failed to set mode to {mode}"
+    assert db.get_mode(chat_id) == mode
 
-    def test_default_mode(self):
-        """Test that a new chat has 'auto' mode by default."""
-        # Querying a non-existent chat should return default
-        mode = self.db.get_mode(12345)
-        self.assertEqual(mode, "auto")
 
-    def test_set_get_mode(self):
-        """Test setting and retrieving modes."""
-        chat_id = 67890
+def test_mode_can_be_changed(db):
+    """Test that a later set_mode overwrites the stored mode."""
+    chat_id = 67890
+    db.set_mode(chat_id, "manual")
+    db.set_mode(chat_id, "auto")
+    assert db.get_mode(chat_id) == "auto"
 
-        # Initial check
-        self.assertEqual(self.db.get_mode(chat_id), "auto")
 
-        # Set to manual
-        success = self.db.set_mode(chat_id, "manual")
-        self.assertTrue(success, "Failed to set mode to manual")
-        self.assertEqual(self.db.get_mode(chat_id), "manual")
+def test_persistence_mixed_with_languages(db):
+    """Test that mode works correctly alongside language settings."""
+    chat_id = 111222
 
-        # Set back to auto
-        success = self.db.set_mode(chat_id, "auto")
-        self.assertTrue(success, "Failed to set mode to auto")
-        self.assertEqual(self.db.get_mode(chat_id), "auto")
+    # 1. Set languages
+    db.set_languages(chat_id, "fr", "de")
 
-        # Set to interactive (future proofing)
-        success = self.db.set_mode(chat_id, "interactive")
-        self.assertTrue(success)
-        self.assertEqual(self.db.get_mode(chat_id), "interactive")
+    # 2. Check default mode is still auto
+    assert db.get_mode(chat_id) == "auto"
 
-    def test_persistence_mixed_with_languages(self):
-        """Test that mode works correctly alongside language settings."""
-        chat_id = 111222
+    # 3. Change mode
+    db.set_mode(chat_id, "manual")
 
-        # 1. Set languages
-        self.db.set_languages(chat_id, "fr", "de")
+    # 4. Verify languages are preserved
+    assert db.get_languages(chat_id) == ("fr", "de")
 
-        # 2. Check default mode is still auto
-        self.assertEqual(self.db.get_mode(chat_id), "auto")
+    # 5. Verify mode is preserved
+    assert db.get_mode(chat_id) == "manual"
 
-        # 3. Change mode
-        self.db.set_mode(chat_id, "manual")
 
-        # 4. Verify languages are preserved
-        self.assertEqual(self.db.get_languages(chat_id), ("fr", "de"))
+def test_default_voice_gender(db):
+    """Test that voice gender defaults to male."""
+    assert db.get_voice_gender(999) == "male"
 
-        # 5. Verify mode is preserved
-        self.assertEqual(self.db.get_mode(chat_id), "manual")
 
-    def test_voice_gender(self):
-        """Test setting and retrieving voice gender."""
-        chat_id = 999
+@pytest.mark.parametrize("gender", ["female", "male"])
+def test_voice_gender(db, gender):
+    """Test setting and retrieving voice gender."""
+    chat_id = 999
+    assert db.set_voice_gender(chat_id, gender)
+    assert db.get_voice_gender(chat_id) == gender
 
-        # Default should be male
-        self.assertEqual(self.db.get_voice_gender(chat_id), "male")
 
-        # Set to female
-        success = self.db.set_voice_gender(chat_id, "female")
-        self.assertTrue(success)
-        self.assertEqual(self.db.get_voice_gender(chat_id), "female")
+def test_invalid_voice_gender_rejected(db):
+    """Test that an unknown gender is rejected and the old one kept."""
+    chat_id = 999
+    db.set_voice_gender(chat_id, "female")
+    assert not db.set_voice_gender(chat_id, "robot")
+    assert db.get_voice_gender(chat_id) == "female"
 
-        # Set back to male
-        self.db.set_voice_gender(chat_id, "male")
-        self.assertEqual(self.db.get_voice_gender(chat_id), "male")
 
-        # Invalid gender should fail
-        success = self.db.set_voice_gender(chat_id, "robot")
-        self.assertFalse(success)
-        self.assertEqual(self.db.get_voice_gender(chat_id), "male")
+def test_voice_presets(db):
+    """Test setting, retrieving, and clearing voice presets."""
+    chat_id = 777
 
-    def test_voice_presets(self):
-        """Test setting, retrieving, and clearing voice presets."""
-        chat_id = 777
+    # Set preset for EN Male
+    assert db.set_voice_preset(chat_id, "en", "male", "en_99")
 
-        # Set preset for EN Male
-        success = self.db.set_voice_preset(chat_id, "en", "male", "en_99")
-        self.assertTrue(success)
+    # Retrieve it
+    assert db.get_voice_preset(chat_id, "en", "male") == "en_99"
 
-        # Retrieve it
-        preset = self.db.get_voice_preset(chat_id, "en", "male")
-        self.assertEqual(preset, "en_99")
+    # Check unknown preset (should return None)
+    assert db.get_voice_preset(chat_id, "ru", "male") is None
 
-        # Check unknown preset (should return None)
-        preset = self.db.get_voice_preset(chat_id, "ru", "male")
-        self.assertIsNone(preset)
+    # Check case insensitivity
+    db.set_voice_preset(chat_id, "UA", "FeMaLe", "mykyta")
+    assert db.get_voice_preset(chat_id, "ua", "female") == "mykyta"
 
-        # Check case insensitivity
-        self.db.set_voice_preset(chat_id, "UA", "FeMaLe", "mykyta")
-        preset = self.db.get_voice_preset(chat_id, "ua", "female")
-        self.assertEqual(preset, "mykyta")
+    # Clear presets
+    assert db.delete_voice_presets(chat_id)
 
-        # Clear presets
-        success = self.db.delete_voice_presets(chat_id)
-        self.assertTrue(success)
+    # Verify cleared
+    assert db.get_voice_preset(chat_id, "en", "male") is None
 
-        # Verify cleared
-        preset = self.db.get_voice_preset(chat_id, "en", "male")
-        self.assertIsNone(preset)
 
+def test_add_terms_skips_existing(db):
+    """Test bulk insert writes only new or changed terms."""
+    chat_id = 888
 
-if __name__ == "__main__":
-    unittest.main()
+    assert db.add_terms(chat_id, [("Кот", "cat"), ("кота", "cat")], "ru-en") == 2
+
+    # Same pairs again: nothing to write
+    assert db.add_terms(chat_id, [("кот", "cat"), ("кота", "cat")], "ru-en") == 0
+
+    # Changed target is updated, new variant is added
+    assert db.add_terms(chat_id, [("кот", "tomcat"), ("коту", "cat")], "ru-en") == 2
+    assert sorted(db.get_terms(chat_id, "ru-en")) == [
+        ("кот", "tomcat"),
+        ("кота", "cat"),
+        ("коту", "cat"),
+    ]
+
+
+def test_get_chat_translation_settings(db):
+    """Languages and the matching dictionary come back together."""
+    chat_id = 600
+    assert db.get_chat_translation_settings(chat_id) == ("ru", "en", [])
+
+    db.set_languages(chat_id, "en", "de")
+    db.add_terms(chat_id, [("hallo", "hello")], "de-en")
+    db.add_terms(chat_id, [("кот", "cat")], "en-ru")
+    assert db.get_chat_translation_settings(chat_id) == (
+        "en",
+        "de",
+        [("hallo", "hello")],
+    )
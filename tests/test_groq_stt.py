@@ -1,99 +1,179 @@
-import unittest
-from unittest.mock import MagicMock, mock_open, patch
-
-from tg_translator.translator_service import TranslatorService
-
-
-class TestGroqSTT(unittest.IsolatedAsyncioTestCase):
-    def setUp(self):
-        # Prevent actual API calls or model loading
-        with patch("tg_translator.translator_service.os.getenv") as mock_env:
-            mock_env.return_value = None
-            self.service = TranslatorService()
-
-        # Mock AudioSegment to avoid real file operations
-        self.audio_patcher = patch("tg_translator.translator_service.AudioSegment")
-        self.MockAudioSegment = self.audio_patcher.start()
-
-    def tearDown(self):
-        self.audio_patcher.stop()
-        self.service.shutdown()
-
-    def test_transcribe_groq_sync_success(self):
-        """Test successful transcription via Groq."""
-        # Setup mock client
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.text = "Transcribed text"
-        mock_client.audio.transcriptions.create.return_value = mock_response
-
-        self.service.groq_client = mock_client
-
-        # Mock file open
-        m = mock_open(read_data=b"audio data")
-        with patch("builtins.open", m):
-            result = self.service._transcribe_groq_sync("test.ogg")
-
-        self.assertEqual(result, "Transcribed text")
-
-        # Verify conversion was called
-        self.MockAudioSegment.from_ogg.assert_called_with("test.ogg")
-        self.MockAudioSegment.from_ogg.return_value.export.assert_called()
-
-        # Verify API call
-        mock_client.audio.transcriptions.create.assert_called_once()
-        args, kwargs = mock_client.audio.transcriptions.create.call_args
-        self.assertEqual(kwargs["model"], "whisper-large-v3")
-
-    def test_transcribe_groq_sync_failure(self):
-        """Test Groq failure returns None."""
-        mock_client = MagicMock()
-        mock_client.audio.transcriptions.create.side_effect = Exception("API Error")
-        self.service.groq_client = mock_client
-
-        m = mock_open(read_data=b"audio data")
-        with patch("builtins.open", m):
-            result = self.service._transcribe_groq_sync("test.ogg")
-
-        self.assertIsNone(result)
-
-    @patch("tg_translator.translator_service.TranslatorService._transcribe_sync")
-    async def test_transcribe_audio_uses_groq(self, mock_local_transcribe):
-        """Test that transcribe_audio prefers Groq when available."""
-        # Setup Groq mock
-        mock_client = MagicMock()
-        mock_response = MagicMock()
-        mock_response.text = "Groq Result"
-        mock_client.audio.transcriptions.create.return_value = mock_response
-        self.service.groq_client = mock_client
-
-        # Mock file IO
-        m = mock_open(read_data=b"data")
-        with patch("builtins.open", m):
-            result = await self.service.transcribe_audio("test.ogg")
-
-        self.assertEqual(result, "Groq Result")
-
-        # Verify local Whisper was NOT called
-        mock_local_transcribe.assert_not_called()
-
-    @patch("tg_translator.translator_service.TranslatorService._transcribe_sync")
-    async def test_transcribe_audio_fallback(self, mock_local_transcribe):
-        """Test fallback to local Whisper when Groq fails."""
-        # Setup Groq failure
-        mock_client = MagicMock()
-        mock_client.audio.transcriptions.create.side_effect = Exception("Fail")
-        self.service.groq_client = mock_client
-
-        # Setup local success
-        mock_local_transcribe.return_value = "Local Result"
-
-        # Mock file IO
-        m = mock_open(read_data=b"data")
-        with patch("builtins.open", m):
-            result = await self.service.transcribe_audio("test.ogg")
-
-        self.assertEqual(result, "Local Result")
-
-        # Verify local Whisper WAS called
-        mock_local_transcribe.assert_called_once()
+import io
+import wave
+from unittest.mock import MagicMock, patch
+
+import av  # type: ignore
+import numpy as np
+import pytest
+
+from tg_translator.translator_service import TranslatorService, _encode_mp3
+
+
+def fake_open(_path, _mode="rb", *args, **kwargs):
+    """Stand-in for open(): a fresh in-memory audio file on every call."""
+    return io.BytesIO(b"OggS audio data")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _mock_encode():
+    """
+    Mock the conversion to avoid real file operations, once per module.
+    test_encode_mp3 calls the function imported above, so it stays real.
+    """
+    with patch(
+        "tg_translator.translator_service._encode_mp3", return_value=b"mp3 bytes"
+    ) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_encode(_mock_encode):
+    """The module-wide conversion mock with call history cleared."""
+    _mock_encode.reset_mock()
+    return _mock_encode
+
+
+@pytest.fixture
+def mock_local_transcribe():
+    """Mock local Whisper so the fallback never loads a model."""
+    with patch.object(TranslatorService, "_transcribe_sync") as mock:
+        yield mock
+
+
+def test_transcribe_groq_sync_success(service, mock_encode):
+    """Test successful transcription via Groq."""
+    # Setup mock client
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.text = "Transcribed text"
+    mock_client.audio.transcriptions.create.return_value = mock_response
+
+    service.groq_client = mock_client
+
+    with patch("builtins.open", fake_open):
+        result = service._transcribe_groq_sync("test.ogg")
+
+    assert result == "Transcribed text"
+
+    # Verify conversion was called; the MP3 is built in memory
+    mock_encode.assert_called_with("test.ogg")
+
+    # Verify API call
+    mock_client.audio.transcriptions.create.assert_called_once()
+    args, kwargs = mock_client.audio.transcriptions.create.call_args
+    assert kwargs["model"] == "whisper-large-v3"
+    assert kwargs["file"] == ("test.ogg.mp3", b"mp3 bytes")
+
+
+def test_transcribe_groq_sync_passes_whisper_wav_through(
+    service, mock_encode, tmp_path
+):
+    """Test 16 kHz mono WAV is uploaded without re-encoding."""
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create.return_value.text = "Text"
+    service.groq_client = mock_client
+
+    path = tmp_path / "upload.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(16000)
+        w.writeframes(b"\x00\x00" * 1600)
+
+    result = service._transcribe_groq_sync(str(path))
+
+    assert result == "Text"
+    mock_encode.assert_not_called()
+    _, kwargs = mock_client.audio.transcriptions.create.call_args
+    assert kwargs["file"] == ("upload.wav", path.read_bytes())
+
+
+@pytest.mark.parametrize("name", ["note.mp3", "memo.M4A", "clip.webm"])
+def test_transcribe_groq_sync_no_conversion(service, mock_encode, name):
+    """Test formats Groq accepts are uploaded without re-encoding."""
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create.return_value.text = "Text"
+    service.groq_client = mock_client
+
+    with patch("builtins.open", fake_open):
+        result = service._transcribe_groq_sync(name)
+
+    assert result == "Text"
+    mock_encode.assert_not_called()
+    _, kwargs = mock_client.audio.transcriptions.create.call_args
+    assert kwargs["file"] == (name, b"OggS audio data")
+
+
+def test_transcribe_groq_sync_failure(service, mock_encode):
+    """Test Groq failure returns None."""
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create.side_effect = Exception("API Error")
+    service.groq_client = mock_client
+
+    with patch("builtins.open", fake_open):
+        result = service._transcribe_groq_sync("test.ogg")
+
+    assert result is None
+    mock_client.audio.transcriptions.create.assert_called_once()
+
+
+async def test_transcribe_audio_uses_groq(service, mock_encode, mock_local_transcribe):
+    """Test that transcribe_audio prefers Groq when available."""
+    # Setup Groq mock
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.text = "Groq Result"
+    mock_client.audio.transcriptions.create.return_value = mock_response
+    service.groq_client = mock_client
+
+    # Mock file IO
+    with patch("builtins.open", fake_open):
+        result = await service.transcribe_audio("test.ogg")
+
+    assert result == "Groq Result"
+
+    # Verify local Whisper was NOT called
+    mock_local_transcribe.assert_not_called()
+
+
+async def test_transcribe_audio_fallback(service, mock_encode, mock_local_transcribe):
+    """Test fallback to local Whisper when Groq fails."""
+    # Setup Groq failure
+    mock_client = MagicMock()
+    mock_client.audio.transcriptions.create.side_effect = Exception("Fail")
+    service.groq_client = mock_client
+
+    # Setup local success
+    mock_local_transcribe.return_value = "Local Result"
+
+    # Mock file IO
+    with patch("builtins.open", fake_open):
+        result = await service.transcribe_audio("test.ogg")
+
+    assert result == "Local Result"
+
+    # Verify local Whisper WAS called
+    mock_local_transcribe.assert_called_once()
+
+
+def test_encode_mp3(tmp_path):
+    """Test OGG Opus is re-encoded in-process to 16 kHz mono MP3."""
+    path = str(tmp_path / "voice.ogg")
+    with av.open(path, "w") as out:
+        stream = out.add_stream("libopus", rate=48000, layout="mono")
+        frame = av.AudioFrame.from_ndarray(
+            np.zeros((1, 48000), dtype=np.int16), format="s16", layout="mono"
+        )
+        frame.sample_rate = 48000
+        for packet in stream.encode(frame):
+            out.mux(packet)
+        for packet in stream.encode(None):
+            out.mux(packet)
+
+    data = _encode_mp3(path)
+
+    with av.open(io.BytesIO(data)) as mp3:
+        audio = mp3.streams.audio[0]
+        assert mp3.format.name == "mp3"
+        assert audio.rate == 16000
+        assert audio.channels == 1
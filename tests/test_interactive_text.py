@@ -1,40 +1,35 @@
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
-import pytest
-from telegram import Chat, Message, Update, User
-from telegram.ext import ContextTypes
-
 from tg_translator.handlers.translation import handle_message
 
 
-@pytest.mark.asyncio
 async def test_handle_message_interactive_mode_saves_text():
     """
     Test that when in interactive mode, text messages are saved to DB
     so they can be retrieved by the callback handler even if reply context is lost.
     """
     # Setup
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-    update.message = MagicMock(spec=Message)
-    update.message.text = "Hello World"
-    update.message.from_user = MagicMock(spec=User)
-    update.message.from_user.username = "testuser"
-
-    # Mock reply_text to return a message object with an ID
-    sent_message = MagicMock(spec=Message)
-    sent_message.message_id = 999
-    update.message.reply_text = AsyncMock(return_value=sent_message)
-
-    context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+    # reply_text returns a message object with an ID
+    sent_message = SimpleNamespace(message_id=999)
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        message=SimpleNamespace(
+            text="Hello World",
+            from_user=SimpleNamespace(username="testuser"),
+            reply_text=AsyncMock(return_value=sent_message),
+        ),
+    )
+
     mock_db = MagicMock()
     # Mode is interactive
     mock_db.get_mode.return_value = "interactive"
     # Languages
     mock_db.get_languages.return_value = ("ru", "en")
 
-    context.bot_data = {"db": mock_db, "translator_service": MagicMock()}
+    context = SimpleNamespace(
+        bot_data={"db": mock_db, "translator_service": MagicMock()}
+    )
 
     # Execute
     await handle_message(update, context)
@@ -46,3 +41,47 @@ async def test_handle_message_interactive_mode_saves_text():
     # 2. Text was saved to DB
     expected_key = "12345:999"
     mock_db.add_transcription.assert_called_with(expected_key, "Hello World")
+
+
+async def test_handle_message_skips_text_without_letters():
+    """Numbers-only messages are not sent for translation."""
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        message=SimpleNamespace(text="15:30 — 42!", reply_text=AsyncMock()),
+    )
+
+    mock_db = MagicMock()
+    mock_service = MagicMock()
+    mock_service.translate_message = AsyncMock()
+    context = SimpleNamespace(
+        bot_data={"db": mock_db, "translator_service": mock_service}
+    )
+
+    await handle_message(update, context)
+
+    mock_db.get_mode.assert_not_called()
+    mock_service.translate_message.assert_not_called()
+    update.message.reply_text.assert_not_called()
+
+
+async def test_handle_message_interactive_detects_cyrillic_supplement():
+    """Ukrainian-only letters (і, ї, є) count as Cyrillic for the button label."""
+    sent_message = SimpleNamespace(message_id=1000)
+    update = SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        message=SimpleNamespace(
+            text="її є", reply_text=AsyncMock(return_value=sent_message)
+        ),
+    )
+
+    mock_db = MagicMock()
+    mock_db.get_mode.return_value = "interactive"
+    mock_db.get_languages.return_value = ("uk", "en")
+    context = SimpleNamespace(
+        bot_data={"db": mock_db, "translator_service": MagicMock()}
+    )
+
+    await handle_message(update, context)
+
+    markup = update.message.reply_text.call_args.kwargs["reply_markup"]
+    assert markup.inline_keyboard[0][0].text == "🌐 to EN"
@@ -1,62 +1,194 @@
-from unittest.mock import AsyncMock, MagicMock
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import pytest_asyncio
 from telegram import (
     BotCommandScopeAllChatAdministrators,
     BotCommandScopeAllGroupChats,
     BotCommandScopeAllPrivateChats,
+    Update,
 )
 from telegram.ext import Application
 
 # Import the function to be tested
-from tg_translator.main import post_init
+import tg_translator.main as main_module
+from tg_translator.main import cleanup_tmp_dir, post_init, systemd_notify
 
 
-@pytest.mark.asyncio
-async def test_post_init_sets_commands_correctly():
+@pytest_asyncio.fixture(scope="session")
+async def app_after_post_init():
     """
-    Test that post_init registers commands for all required scopes:
-    1. Default
-    2. Private Chats
-    3. Group Chats
-    4. Group Chat Administrators (Critical fix)
+    Mock application on which post_init has already run.
+    Built once: the tests only read its recorded calls.
     """
     # Mock the application and its bot
     app = MagicMock(spec=Application)
     app.bot = MagicMock()
     app.bot.set_my_commands = AsyncMock()
 
-    # Call the function
     await post_init(app)
+    return app
+
 
+async def test_post_init_sets_commands_correctly(app_after_post_init):
+    """
+    Test that post_init registers commands for all required scopes:
+    1. Default
+    2. Private Chats
+    3. Group Chats
+    4. Group Chat Administrators (Critical fix)
+    """
     # Verify set_my_commands was called 4 times
     assert (
-        app.bot.set_my_commands.call_count == 4
+        app_after_post_init.bot.set_my_commands.call_count == 4
     ), "set_my_commands should be called 4 times"
 
-    # Get all calls
-    calls = app.bot.set_my_commands.call_args_list
-
     # 1. Default scope (first call)
     # The first call passes commands list without scope kwarg
-    args, kwargs = calls[0]
+    args, kwargs = app_after_post_init.bot.set_my_commands.call_args_list[0]
     assert len(args) == 1  # commands list
     assert "scope" not in kwargs or kwargs["scope"] is None
 
-    # 2. Private chats scope
-    _, kwargs = calls[1]
-    assert isinstance(
-        kwargs["scope"], BotCommandScopeAllPrivateChats
-    ), "Second call should be for Private Chats"
-
-    # 3. Group chats scope
-    _, kwargs = calls[2]
-    assert isinstance(
-        kwargs["scope"], BotCommandScopeAllGroupChats
-    ), "Third call should be for Group Chats"
-
-    # 4. Group chat administrators scope (The Fix)
-    _, kwargs = calls[3]
-    assert isinstance(
-        kwargs["scope"], BotCommandScopeAllChatAdministrators
-    ), "Fourth call should be for Group Chat Administrators"
+
+@pytest.mark.parametrize(
+    "idx,scope_cls",
+    [
+        (1, BotCommandScopeAllPrivateChats),
+        (2, BotCommandScopeAllGroupChats),
+        # Group chat administrators (The Fix)
+        (3, BotCommandScopeAllChatAdministrators),
+    ],
+)
+async def test_post_init_scope(app_after_post_init, idx, scope_cls):
+    """Each non-default scope gets its own set_my_commands call, in order."""
+    _, kwargs = app_after_post_init.bot.set_my_commands.call_args_list[idx]
+    assert isinstance(kwargs["scope"], scope_cls)
+
+
+def test_cleanup_tmp_dir_removes_only_stale_files(tmp_path):
+    """Old files are swept, fresh ones (still being sent) are kept."""
+    stale = tmp_path / "tts_silero_old.mp3"
+    fresh = tmp_path / "tts_silero_new.mp3"
+    stale.write_bytes(b"old")
+    fresh.write_bytes(b"new")
+    old_time = time.time() - 3600
+    os.utime(stale, (old_time, old_time))
+
+    removed = cleanup_tmp_dir(str(tmp_path), max_age=600)
+
+    assert removed == 1
+    assert not stale.exists()
+    assert fresh.exists()
+    # Missing directory is not an error
+    assert cleanup_tmp_dir(str(tmp_path / "missing")) == 0
+
+
+@pytest.fixture
+def notify_socket(monkeypatch):
+    """Patched socket module for systemd_notify, starting with no connection."""
+    monkeypatch.setenv("NOTIFY_SOCKET", "@systemd-notify")
+    monkeypatch.setattr(main_module, "_notify_sock", None)
+    with patch.object(main_module.socket, "socket") as socket_cls:
+        # monkeypatch restores _notify_sock, so the mock never leaks out
+        yield socket_cls
+
+
+def test_systemd_notify_reuses_socket(notify_socket):
+    """Repeated notifications go through one connected socket."""
+    systemd_notify("READY=1")
+    systemd_notify("WATCHDOG=1")
+    systemd_notify("WATCHDOG=1")
+
+    notify_socket.assert_called_once()
+    sock = notify_socket.return_value
+    # Abstract namespace address: "@" becomes a leading NUL byte
+    sock.connect.assert_called_once_with("\0systemd-notify")
+    assert sock.sendall.call_count == 3
+    sock.sendall.assert_called_with(b"WATCHDOG=1")
+
+
+def test_systemd_notify_reconnects_after_error(notify_socket):
+    """A failed send closes the socket and the next call opens a new one."""
+    broken, fresh = MagicMock(), MagicMock()
+    broken.sendall.side_effect = OSError("Connection refused")
+    notify_socket.side_effect = [broken, fresh]
+
+    systemd_notify("WATCHDOG=1")
+    broken.close.assert_called_once()
+    assert main_module._notify_sock is None
+
+    systemd_notify("WATCHDOG=1")
+    assert notify_socket.call_count == 2
+    fresh.sendall.assert_called_once_with(b"WATCHDOG=1")
+    assert main_module._notify_sock is fresh
+
+
+def test_systemd_notify_without_socket_env(notify_socket, monkeypatch):
+    """Outside systemd no socket is opened."""
+    monkeypatch.delenv("NOTIFY_SOCKET")
+    systemd_notify("WATCHDOG=1")
+    notify_socket.assert_not_called()
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    """
+    Run main() with the model/DB setup stubbed and the run loops patched out.
+    Returns the (run_webhook, run_polling) mocks.
+    """
+    for name in ("WEBHOOK_URL", "WEBHOOK_LISTEN", "PORT", "WEBHOOK_SECRET"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "123:abc")
+    monkeypatch.setattr(main_module, "load_dotenv", lambda: None)
+    monkeypatch.setattr(main_module, "Database", MagicMock())
+    monkeypatch.setattr(main_module, "TranslatorService", MagicMock())
+
+    def run():
+        with (
+            patch.object(Application, "run_webhook") as run_webhook,
+            patch.object(Application, "run_polling") as run_polling,
+        ):
+            main_module.main()
+        return run_webhook, run_polling
+
+    return run
+
+
+def test_main_polls_without_webhook_url(run_main):
+    """Long polling stays the default."""
+    run_webhook, run_polling = run_main()
+
+    run_webhook.assert_not_called()
+    run_polling.assert_called_once_with(allowed_updates=Update.ALL_TYPES)
+
+
+def test_main_webhook_defaults(run_main, monkeypatch):
+    """WEBHOOK_URL alone switches to webhook mode on the default port."""
+    monkeypatch.setenv("WEBHOOK_URL", "https://bot.example.com/")
+    run_webhook, run_polling = run_main()
+
+    run_polling.assert_not_called()
+    run_webhook.assert_called_once_with(
+        listen="0.0.0.0",
+        port=8443,
+        url_path="123:abc",
+        webhook_url="https://bot.example.com/123:abc",
+        allowed_updates=Update.ALL_TYPES,
+        secret_token=None,
+    )
+
+
+def test_main_webhook_port_and_secret(run_main, monkeypatch):
+    """PORT and WEBHOOK_SECRET are passed through to run_webhook."""
+    monkeypatch.setenv("WEBHOOK_URL", "https://bot.example.com")
+    monkeypatch.setenv("PORT", "8080")
+    monkeypatch.setenv("WEBHOOK_SECRET", "s3cret")
+    run_webhook, run_polling = run_main()
+
+    run_polling.assert_not_called()
+    kwargs = run_webhook.call_args.kwargs
+    assert kwargs["port"] == 8080
+    assert kwargs["secret_token"] == "s3cret"
+    assert kwargs["webhook_url"] == "https://bot.example.com/123:abc"
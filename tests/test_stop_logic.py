@@ -1,89 +1,78 @@
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import AsyncMock
 
 import pytest
-from telegram import Chat, Message, Update
-from telegram.ext import ContextTypes
 
 from tg_translator.handlers.admin import stop_command
 from tg_translator.handlers.translation import handle_message
 
 
-@pytest.mark.asyncio
-async def test_stop_command():
+def make_update(text: Optional[str] = None, chat_id: int = 12345) -> SimpleNamespace:
+    """
+    Minimal stand-in for a PTB Update: only what the handlers read.
+    Cheaper than MagicMock(spec=Update), and a missing attribute fails loudly.
+    """
+    return SimpleNamespace(
+        effective_chat=SimpleNamespace(id=chat_id),
+        message=SimpleNamespace(
+            text=text,
+            from_user=SimpleNamespace(username="testuser", first_name="Test"),
+            reply_text=AsyncMock(),
+        ),
+    )
+
+
+async def test_stop_command(db):
     """Test that /stop command sets DB mode to 'off'."""
     # Setup
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-    update.message = AsyncMock(spec=Message)
-
-    context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
-    mock_db = MagicMock()
-    mock_db.set_mode.return_value = True
-    context.bot_data = {"db": mock_db}
+    update = make_update()
+    context = SimpleNamespace(bot_data={"db": db})
 
     # Act
     await stop_command(update, context)
 
     # Assert
-    mock_db.set_mode.assert_called_with(12345, "off")
+    assert db.get_mode(12345) == "off"
     update.message.reply_text.assert_called_once()
     assert "stopped" in update.message.reply_text.call_args[0][0].lower()
 
 
-@pytest.mark.asyncio
-async def test_off_mode_ignores_message():
-    """Test that handle_message does nothing if mode is 'off'."""
+@pytest.mark.parametrize("mode", ["off", "manual"])
+async def test_silent_modes_ignore_message(db, mode):
+    """Test that handle_message does nothing if mode is 'off' or 'manual'."""
     # Setup
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-    update.message = MagicMock(spec=Message)
-    update.message.text = "Hello world"
-    update.message.from_user = MagicMock()
-
-    context = MagicMock()
-    mock_db = MagicMock()
-    mock_db.get_mode.return_value = "off"  # MODE IS OFF
+    update = make_update(text="Hello world")
+    db.set_mode(12345, mode)
 
     mock_service = AsyncMock()
-    context.bot_data = {"db": mock_db, "translator_service": mock_service}
+    context = SimpleNamespace(bot_data={"db": db, "translator_service": mock_service})
 
     # Act
     await handle_message(update, context)
 
     # Assert
-    # Should check mode
-    mock_db.get_mode.assert_called_with(12345)
-    # Should NOT call translate
+    # Should NOT call translate or reply
     mock_service.translate_message.assert_not_called()
+    update.message.reply_text.assert_not_called()
 
 
-@pytest.mark.asyncio
-async def test_interactive_mode_sends_button():
+async def test_interactive_mode_sends_button(db):
     """Test that handle_message replies with button in interactive mode."""
-    # Setup
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-    update.message = AsyncMock(spec=Message)
-    update.message.text = "Hello world"
-    update.message.from_user = MagicMock()
-
-    context = MagicMock()
-    mock_db = MagicMock()
-    mock_db.get_mode.return_value = "interactive"
-    mock_db.get_languages.return_value = ("ru", "en")
+    # Setup: default languages are ru/en
+    update = make_update(text="Hello world")
+    update.message.reply_text.return_value = SimpleNamespace(message_id=500)
+    db.set_mode(12345, "interactive")
 
     mock_service = AsyncMock()
-    context.bot_data = {"db": mock_db, "translator_service": mock_service}
+    context = SimpleNamespace(bot_data={"db": db, "translator_service": mock_service})
 
     # Act
     await handle_message(update, context)
 
     # Assert
-    # Should check mode
-    mock_db.get_mode.assert_called_with(12345)
+    # Original text is kept for the button callback
+    assert db.get_transcription("12345:500") == "Hello world"
     # Should NOT call translate automatically
     mock_service.translate_message.assert_not_called()
 
@@ -101,31 +90,20 @@ async def test_interactive_mode_sends_button():
     assert button.text == "🌐 to RU"
 
 
-@pytest.mark.asyncio
-async def test_auto_mode_translates_message():
+async def test_auto_mode_translates_message(db):
     """Test that handle_message calls translator if mode is auto."""
-    # Setup
-    update = MagicMock(spec=Update)
-    update.effective_chat = MagicMock(spec=Chat)
-    update.effective_chat.id = 12345
-    update.message = AsyncMock(spec=Message)
-    update.message.text = "Hello world"
-    update.message.from_user = MagicMock()
-
-    context = MagicMock()
-    mock_db = MagicMock()
-    mock_db.get_mode.return_value = "auto"  # MODE IS AUTO
+    # Setup: a new chat is in auto mode
+    update = make_update(text="Hello world")
 
     mock_service = AsyncMock()
     # Return a translation different from source to trigger reply
     mock_service.translate_message.return_value = "Привет мир"
 
-    context.bot_data = {"db": mock_db, "translator_service": mock_service}
+    context = SimpleNamespace(bot_data={"db": db, "translator_service": mock_service})
 
     # Act
     await handle_message(update, context)
 
     # Assert
-    mock_db.get_mode.assert_called_with(12345)
     mock_service.translate_message.assert_called_with("Hello world", 12345)
     update.message.reply_text.assert_called_once()
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tg_translator.handlers.translation import handle_voice
+
+
+@pytest.fixture
+def voice_update(tmp_path, monkeypatch):
+    """Voice message update; the handler's tmp/ download dir lands in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    voice_file = SimpleNamespace(download_to_drive=AsyncMock())
+    return SimpleNamespace(
+        effective_chat=SimpleNamespace(id=12345),
+        message=SimpleNamespace(
+            voice=SimpleNamespace(
+                file_unique_id="abc", get_file=AsyncMock(return_value=voice_file)
+            ),
+            from_user=SimpleNamespace(username="testuser"),
+            reply_text=AsyncMock(),
+        ),
+    )
+
+
+def make_context(transcription: str, translation: str) -> SimpleNamespace:
+    db = MagicMock()
+    db.get_mode.return_value = "auto"
+    translator_service = SimpleNamespace(
+        transcribe_audio=AsyncMock(return_value=transcription),
+        translate_message=AsyncMock(return_value=translation),
+    )
+    return SimpleNamespace(
+        bot_data={"db": db, "translator_service": translator_service}
+    )
+
+
+async def test_handle_voice_replies_with_transcription_and_translation(voice_update):
+    context = make_context("Привет <всем>", "Hello <all>")
+
+    await handle_voice(voice_update, context)
+
+    # The reply goes to the voice message itself
+    voice_update.message.reply_text.assert_called_once()
+    args, kwargs = voice_update.message.reply_text.call_args
+    assert args[0] == "🎤 <i>Привет &lt;всем&gt;</i>\nHello &lt;all&gt;"
+    assert kwargs["parse_mode"] == "HTML"
+    button = kwargs["reply_markup"].inline_keyboard[0][0]
+    assert button.callback_data == "speak"
+    context.bot_data["translator_service"].translate_message.assert_called_once_with(
+        "Привет <всем>", 12345
+    )
+
+
+async def test_handle_voice_omits_unchanged_translation(voice_update):
+    """A translation equal to the transcription is not repeated."""
+    context = make_context("OK", "ok")
+
+    await handle_voice(voice_update, context)
+
+    args, _ = voice_update.message.reply_text.call_args
+    assert args[0] == "🎤 <i>OK</i>"